@@ -1,12 +1,17 @@
 """
 Serviço assíncrono para envio de emails via Celery
 """
-from typing import Optional
+from typing import Dict, List, Optional
+
+from celery import group
+
+from api.utils.celery_app import celery_app
 from api.utils.tasks.email_tasks import (
-    send_password_reset_email_task,
-    send_welcome_email_task,
-    send_verification_email_task,
-    send_notification_email_task
+    enqueue_notification_email,
+    enqueue_password_reset_email,
+    enqueue_verification_email,
+    enqueue_welcome_email,
+    notification_email_signature
 )
 
 
@@ -30,9 +35,11 @@ class AsyncEmailService:
             expiry_time: Tempo de expiração do token
             
         Returns:
-            Task ID para acompanhamento do status
+            Task ID do envio (send_email_task) para acompanhamento do status
         """
-        task = send_password_reset_email_task.delay(
+        # Enfileira direto a tarefa de envio: o id devolvido é o da tarefa que
+        # termina em SUCCESS/FAILURE, e não o de um wrapper sem resultado
+        task = enqueue_password_reset_email(
             to_email=to_email,
             token=token,
             expiry_time=expiry_time
@@ -50,9 +57,9 @@ class AsyncEmailService:
             dashboard_link: Link para o dashboard (opcional)
             
         Returns:
-            Task ID para acompanhamento do status
+            Task ID do envio (send_email_task) para acompanhamento do status
         """
-        task = send_welcome_email_task.delay(
+        task = enqueue_welcome_email(
             to_email=to_email,
             user_name=user_name,
             dashboard_link=dashboard_link
@@ -72,9 +79,9 @@ class AsyncEmailService:
             expiry_time: Tempo de expiração
             
         Returns:
-            Task ID para acompanhamento do status
+            Task ID do envio (send_email_task) para acompanhamento do status
         """
-        task = send_verification_email_task.delay(
+        task = enqueue_verification_email(
             to_email=to_email,
             verification_link=verification_link,
             verification_code=verification_code,
@@ -98,9 +105,9 @@ class AsyncEmailService:
             additional_info: Informações adicionais (opcional)
             
         Returns:
-            Task ID para acompanhamento do status
+            Task ID do envio (send_email_task) para acompanhamento do status
         """
-        task = send_notification_email_task.delay(
+        task = enqueue_notification_email(
             to_email=to_email,
             user_name=user_name,
             message=message,
@@ -110,6 +117,29 @@ class AsyncEmailService:
         )
         return task.id
     
+    @staticmethod
+    def send_notification_bulk(recipients: List[Dict[str, str]]) -> List[str]:
+        """
+        Envia emails de notificação para vários destinatários de forma assíncrona.
+        
+        As tarefas são publicadas juntas com um `group` do Celery, que reutiliza
+        uma única conexão com o broker em vez de uma publicação por destinatário.
+        
+        Args:
+            recipients: Lista de dicionários com os mesmos argumentos de
+                        `send_notification_async` (to_email, user_name, message,
+                        notification_subject, action_button, additional_info)
+            
+        Returns:
+            Lista de Task IDs dos envios (send_email_task), na mesma ordem de `recipients`
+        """
+        if not recipients:
+            return []
+        
+        job = group(notification_email_signature(**recipient) for recipient in recipients)
+        result = job.apply_async()
+        return [task.id for task in result.results]
+    
     @staticmethod
     def get_task_status(task_id: str) -> dict:
         """
@@ -121,8 +151,6 @@ class AsyncEmailService:
         Returns:
             Dicionário com informações do status da tarefa
         """
-        from api.utils.celery_app import celery_app
-        
         try:
             result = celery_app.AsyncResult(task_id)
             
@@ -1,26 +1,89 @@
-from api.utils.redis_db import RedisDB
+import atexit
+import logging
+import os
+import threading
+from typing import List, Optional
+
+from dotenv import load_dotenv
+import redis
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Cliente criado só no primeiro uso: o pool conecta sob demanda e reconecta
+# sozinho, então um Redis fora do ar no import não desativa o buffer para sempre
+_redis_client: Optional[redis.Redis] = None
+_redis_client_lock = threading.Lock()
+
+
+def _get_client() -> Optional[redis.Redis]:
+    """Retorna o cliente Redis compartilhado, ou None se REDIS_URL não estiver definida"""
+    global _redis_client
+    if _redis_client is None:
+        with _redis_client_lock:
+            if _redis_client is None:
+                redis_url = os.getenv("REDIS_URL")
+                if not redis_url:
+                    logger.error("REDIS_URL não encontrada nas variáveis de ambiente")
+                    return None
+                _redis_client = redis.from_url(redis_url, decode_responses=True)
+                atexit.register(_redis_client.close)
+    return _redis_client
+
 
 def add_message_to_buffer(telefone: str, message: str):
-    print(f"🔄 Adicionando mensagem para {telefone}: {message}")
-    db = RedisDB()
-    result = db.add_message(telefone, message)
-    print(f"🔄 Resultado da adição: {result}")
-    db.close_connections()
-    return result
+    logger.debug("Adicionando mensagem para %s: %s", telefone, message)
+    client = _get_client()
+    if client is None:
+        return False
+    try:
+        client.rpush(telefone, message)
+        return True
+    except redis.RedisError as e:
+        logger.error("Erro ao adicionar mensagem: %s", e)
+        return False
+
+def add_messages_bulk(telefone: str, messages: List[str]):
+    """
+    Adiciona várias mensagens ao buffer em um único round-trip (pipeline).
+    Prefira acumular as mensagens e chamar esta função uma vez por requisição
+    em vez de chamar add_message_to_buffer para cada mensagem.
+    """
+    if not messages:
+        return True
+    logger.debug("Adicionando %d mensagens para %s", len(messages), telefone)
+    client = _get_client()
+    if client is None:
+        return False
+    try:
+        with client.pipeline(transaction=False) as pipe:
+            for message in messages:
+                pipe.rpush(telefone, message)
+            pipe.execute()
+        return True
+    except redis.RedisError as e:
+        logger.error("Erro ao adicionar mensagens em lote: %s", e)
+        return False
 
 def get_message_from_buffer(telefone):
-    print(f"🔍 Buscando mensagens para {telefone}")
-    db = RedisDB()
-    response = db.get_messages(telefone)
-    print(f"🔍 Mensagens encontradas: {response}")
-    db.close_connections()
-    return response
+    logger.debug("Buscando mensagens para %s", telefone)
+    client = _get_client()
+    if client is None:
+        return []
+    try:
+        return client.lrange(telefone, 0, -1) or []
+    except redis.RedisError as e:
+        logger.error("Erro ao recuperar mensagens: %s", e)
+        return []
 
 def remove_message_from_buffer(telefone):
-    print(f"🗑️ Removendo mensagens para {telefone}")
-    db = RedisDB()
-    result = db.delete_messages(telefone)
-    print(f"🗑️ Resultado da remoção: {result}")
-    db.close_connections()
-    return result
-
+    logger.debug("Removendo mensagens para %s", telefone)
+    client = _get_client()
+    if client is None:
+        return False
+    try:
+        return client.delete(telefone) > 0
+    except redis.RedisError as e:
+        logger.error("Erro ao deletar mensagens: %s", e)
+        return False
@@ -1,4 +1,6 @@
 import logging
+from functools import lru_cache
+from types import MappingProxyType
 from typing import List, Optional, Dict, Any, Type, Literal, Tuple, Set
 from sqlalchemy.orm import selectinload, Load, RelationshipProperty
 from sqlalchemy.orm.attributes import InstrumentedAttribute
@@ -8,7 +10,7 @@ from sqlalchemy import asc, desc
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-OPERATOR_MAP = {
+OPERATOR_MAP = MappingProxyType({
     'eq': lambda c, v: c == v,
     'neq': lambda c, v: c != v,
     'lt': lambda c, v: c < v,
@@ -23,32 +25,36 @@ OPERATOR_MAP = {
     'contains': lambda c, v: c.contains(v), 
     'startswith': lambda c, v: c.startswith(v),
     'endswith': lambda c, v: c.endswith(v),
-}
+})
+
+# Operadores aceitos (minúsculas), para validação antecipada na camada de parsing
+VALID_OPERATORS = frozenset(OPERATOR_MAP)
+_VALID_OPERATORS_MSG = sorted(VALID_OPERATORS)
+
+_LIST_OPERATORS = frozenset({'in', 'notin'})
+_TRUE_STRINGS = frozenset({'true', 'yes', '1', 'on'})
 
 def _parse_bool(value: Any) -> bool:
     """Converte um valor para booleano de forma flexível."""
     if isinstance(value, bool):
         return value
     if isinstance(value, str):
-        return value.lower() in ('true', 'yes', '1', 'on')
+        return value.lower() in _TRUE_STRINGS
     return bool(value)
 
-def _get_column_or_relationship(
+@lru_cache(maxsize=4096)
+def _resolve_field(
     model_cls: Type,
-    field_specifier: str,
-    relations_map: Dict[str, RelationshipProperty]
-) -> Tuple[InstrumentedAttribute, Optional[Type], List[RelationshipProperty]]:
+    field_specifier: str
+) -> Tuple[InstrumentedAttribute, Type, Tuple[InstrumentedAttribute, ...], Optional[str]]:
     """
-    Obtém o atributo SQLAlchemy (coluna ou relação) correspondente a um especificador de campo.
-    Retorna o atributo final, a classe do modelo onde ele está (se for relacionado) e a lista de joins necessários.
-
-    Args:
-        model_cls: A classe do modelo base.
-        field_specifier: O nome do campo (ex: "name", "relation.field", "relation.sub_relation.field").
-        relations_map: Mapa de nomes de string para atributos de relação do model_cls base.
+    Percorre o mapper do modelo para resolver um especificador de campo.
+    O resultado depende apenas de metadados fixos do modelo, por isso é memoizado por processo.
 
     Returns:
-        Uma tupla (atributo_final, classe_do_atributo, joins_necessarios).
+        Uma tupla (atributo_final, classe_do_atributo, joins_necessarios, relacao_primeiro_nivel).
+        `relacao_primeiro_nivel` é o nome da relação do modelo base (ou None se o campo for direto),
+        validada contra o `relations_map` por `_get_column_or_relationship`.
 
     Raises:
         ValueError: Se o campo ou relação for inválido.
@@ -56,7 +62,8 @@ def _get_column_or_relationship(
     parts = field_specifier.split('.')
     current_model = model_cls
     target_attribute = None
-    joins_needed: List[RelationshipProperty] = []
+    joins_needed: List[InstrumentedAttribute] = []
+    first_relation: Optional[str] = None
 
     for i, part in enumerate(parts):
         if not hasattr(current_model, part):
@@ -70,14 +77,9 @@ def _get_column_or_relationship(
                  # O último pedaço não pode ser a própria relação para filtros/sorts
                  raise ValueError(f"Não é possível filtrar/ordenar diretamente pela relação '{part}'. Especifique um campo dentro dela (ex: '{field_specifier}.id').")
 
-            # Adiciona a relação à lista de joins necessários (usando o mapeamento original se for o primeiro nível)
             if i == 0:
-                if part not in relations_map:
-                     raise ValueError(f"Relação '{part}' não encontrada no 'relations_map' fornecido para o modelo base {model_cls.__name__}.")
-                joins_needed.append(relations_map[part])
-            else:
-                # Para relações aninhadas, usamos o atributo diretamente
-                 joins_needed.append(attr) # Adiciona o atributo de relação SQLAlchemy
+                first_relation = part
+            joins_needed.append(attr) # Adiciona o atributo de relação SQLAlchemy
 
             current_model = attr.property.mapper.class_ # Avança para a classe relacionada
         elif isinstance(attr, InstrumentedAttribute):
@@ -92,6 +94,46 @@ def _get_column_or_relationship(
     if target_attribute is None:
          raise ValueError(f"Não foi possível resolver o atributo final para '{field_specifier}'.")
 
+    return target_attribute, current_model, tuple(joins_needed), first_relation
+
+
+def _get_column_or_relationship(
+    model_cls: Type,
+    field_specifier: str,
+    relations_map: Dict[str, RelationshipProperty]
+) -> Tuple[InstrumentedAttribute, Optional[Type], List[RelationshipProperty]]:
+    """
+    Obtém o atributo SQLAlchemy (coluna ou relação) correspondente a um especificador de campo.
+    Retorna o atributo final, a classe do modelo onde ele está (se for relacionado) e a lista de joins necessários.
+
+    Args:
+        model_cls: A classe do modelo base.
+        field_specifier: O nome do campo (ex: "name", "relation.field", "relation.sub_relation.field").
+        relations_map: Mapa de nomes de string para atributos de relação do model_cls base.
+
+    Returns:
+        Uma tupla (atributo_final, classe_do_atributo, joins_necessarios).
+
+    Raises:
+        ValueError: Se o campo ou relação for inválido.
+    """
+    # Caminho rápido: campo direto do modelo base (caso mais comum), sem joins
+    if '.' not in field_specifier:
+        attr = getattr(model_cls, field_specifier, None)
+        if attr is None:
+            raise ValueError(f"Modelo '{model_cls.__name__}' não possui o atributo ou relação '{field_specifier}' especificado em '{field_specifier}'")
+        if isinstance(attr, InstrumentedAttribute) and not isinstance(attr.property, RelationshipProperty):
+            return attr, model_cls, []
+
+    target_attribute, current_model, joins, first_relation = _resolve_field(model_cls, field_specifier)
+    joins_needed: List[RelationshipProperty] = list(joins)
+
+    # O primeiro nível usa o mapeamento original fornecido pelo service
+    if first_relation is not None:
+        if first_relation not in relations_map:
+             raise ValueError(f"Relação '{first_relation}' não encontrada no 'relations_map' fornecido para o modelo base {model_cls.__name__}.")
+        joins_needed[0] = relations_map[first_relation]
+
     return target_attribute, current_model, joins_needed
 
 
@@ -100,6 +142,7 @@ def apply_filters(
     model_cls: Type,
     filter_params: Dict[str, Dict[str, Any]],
     relations_map: Dict[str, RelationshipProperty],
+    applied_joins: Optional[Set[RelationshipProperty]] = None,
     # is_count: bool = False # Otimização para contagem pode ser complexa, omitida por simplicidade inicial
 ) -> Select:
     """
@@ -110,6 +153,8 @@ def apply_filters(
         model_cls: A classe do modelo SQLAlchemy base da query.
         filter_params: Dicionário de filtros. Ex: {'name': {'ilike': '%test%'}, 'relation.status': {'eq': 'active'}}
         relations_map: Mapa de nomes de relação para atributos de relação do model_cls base.
+        applied_joins: Conjunto de joins já aplicados à query. Passe o mesmo conjunto para
+            `apply_sorting` para que a mesma relação não seja juntada duas vezes.
         # is_count: Flag indicando se esta query é para contagem (pode otimizar joins).
 
     Returns:
@@ -118,7 +163,11 @@ def apply_filters(
     Raises:
         ValueError: Se um filtro for inválido (campo, operador ou valor).
     """
-    applied_joins: Set[RelationshipProperty] = set() # Rastreia joins já aplicados
+    if not filter_params:
+        return query # Nenhum filtro a aplicar
+
+    if applied_joins is None:
+        applied_joins = set() # Rastreia joins já aplicados
 
     for field_specifier, operators in filter_params.items():
         if not isinstance(operators, dict):
@@ -134,40 +183,34 @@ def apply_filters(
             raise # Re-lança o erro para o service layer tratar
 
         # Adiciona os joins necessários se ainda não foram aplicados
-        current_join_target = model_cls # Começa do modelo base
         for rel_prop in joins_to_apply:
             # Verifica se o join *deste nível específico* já foi feito
-            # SQLAlchemy pode reutilizar joins, mas rastrear explicitamente pode ser mais claro
-            # if rel_prop not in applied_joins: # TODO: Refinar lógica de join se necessário
+            if rel_prop in applied_joins:
+                continue
             # Usamos isouter=True para garantir que filtros em relações não excluam
             # registros principais que não têm a relação correspondente (comportamento LEFT JOIN)
             query = query.join(rel_prop, isouter=True)
             applied_joins.add(rel_prop)
-            # current_join_target = rel_prop.mapper.class_ # Atualiza para o próximo nível (não usado no momento)
 
 
         # Aplica cada operador para o campo atual
         for op_code, value in operators.items():
-            op_func = OPERATOR_MAP.get(op_code.lower())
+            op_func = OPERATOR_MAP.get(op_code)
             if not op_func:
-                raise ValueError(f"Operador de filtro inválido '{op_code}' para o campo '{field_specifier}'. Válidos: {list(OPERATOR_MAP.keys())}")
+                raise ValueError(f"Operador de filtro inválido '{op_code}' para o campo '{field_specifier}'. Válidos: {_VALID_OPERATORS_MSG}")
 
             try:
                 # TODO: Adicionar conversão de tipo para 'value' se necessário, baseado em target_column.type
                 # Ex: if isinstance(target_column.type, String): value = str(value) etc.
                 # Por enquanto, assume que o valor já está no tipo correto vindo da camada do router/parser.
 
-                # Tratamento especial para 'in' e 'notin' que esperam listas/tuplas
-                if op_code.lower() in ('in', 'notin') and not isinstance(value, (list, tuple)):
-                     # Tenta converter string separada por vírgula em lista
-                     if isinstance(value, str):
-                         value = [item.strip() for item in value.split(',') if item.strip()]
-                     else:
-                         raise ValueError(f"Valor para operador '{op_code}' no campo '{field_specifier}' deve ser uma lista/tupla ou string separada por vírgulas.")
+                # 'in' e 'notin' esperam listas/tuplas (o parser de query já separa os valores por vírgula)
+                if op_code in _LIST_OPERATORS and not isinstance(value, (list, tuple)):
+                     raise ValueError(f"Valor para operador '{op_code}' no campo '{field_specifier}' deve ser uma lista/tupla.")
 
                 filter_expression = op_func(target_column, value)
                 query = query.where(filter_expression) # Aplica a condição WHERE/AND
-                logger.debug(f"Aplicando filtro: {filter_expression}")
+                logger.debug("Aplicando filtro: %s", filter_expression)
 
             except Exception as e:
                 logger.error(f"Erro ao aplicar operador '{op_code}' com valor '{value}' no campo '{field_specifier}': {e}")
@@ -182,7 +225,8 @@ def apply_sorting(
     model_cls: Type,
     sort_by: str,
     sort_dir: Optional[Literal["asc", "desc"]],
-    relations_map: Dict[str, RelationshipProperty]
+    relations_map: Dict[str, RelationshipProperty],
+    applied_joins: Optional[Set[RelationshipProperty]] = None
 ) -> Select:
     """
     Aplica ordenação dinâmica a uma query SQLAlchemy.
@@ -193,6 +237,7 @@ def apply_sorting(
         sort_by: O nome do campo para ordenar (ex: "name", "relation.field").
         sort_dir: A direção da ordenação ("asc" ou "desc").
         relations_map: Mapa de nomes de relação para atributos de relação do model_cls base.
+        applied_joins: Conjunto de joins já aplicados à query (ex: o mesmo usado em `apply_filters`).
 
     Returns:
         A query SQLAlchemy com a ordenação aplicada.
@@ -216,17 +261,24 @@ def apply_sorting(
         logger.error(f"Erro ao processar ordenação por '{sort_by}': {e}")
         raise # Re-lança o erro
 
-    # Adiciona os joins necessários se ainda não estiverem na query (SQLAlchemy pode ser inteligente aqui)
-    # Reaplicar joins aqui garante que eles existam para a ordenação
+    # Campos diretos do modelo não precisam de join
+    if joins_to_apply and applied_joins is None:
+        applied_joins = set()
+
+    # Adiciona apenas os joins que ainda não estão na query
     for rel_prop in joins_to_apply:
+         if rel_prop in applied_joins:
+             continue
          # Usamos isouter=True para consistência com filtros, embora para sort pode não ser estritamente necessário
          query = query.join(rel_prop, isouter=True)
+         applied_joins.add(rel_prop)
 
 
     # Aplica a ordenação
     order_func = asc if direction == "asc" else desc
-    query = query.order_by(order_func(target_column))
-    logger.debug(f"Aplicando ordenação: {order_func(target_column)}")
+    order_clause = order_func(target_column)
+    query = query.order_by(order_clause)
+    logger.debug("Aplicando ordenação: %s", order_clause)
 
     return query
 
@@ -243,6 +295,7 @@ def get_validated_load_options(
         model_cls: A classe do modelo SQLAlchemy base.
         relations_map: Mapa de nomes de relação para atributos de relação do model_cls base.
         include: Lista de nomes de string das relações a serem carregadas (ex: ["users", "tasks"]).
+                 Caminhos aninhados separados por ponto também são aceitos (ex: ["users.tasks"]).
 
     Returns:
         Uma lista de opções SQLAlchemy Load (geralmente selectinload).
@@ -257,18 +310,34 @@ def get_validated_load_options(
         return []
 
     for relation_name in include:
-        if relation_name in relations_map:
-            relation_attr = relations_map[relation_name]
+        # Suporta caminhos aninhados (ex: "aulas.livros") encadeando selectinload por nível
+        root_name, *nested_parts = relation_name.split('.')
+        if root_name in relations_map:
+            relation_attr = relations_map[root_name]
             
             # For Aula.aulas_livros specifically, skip to avoid conflict
-            if model_cls.__name__ == 'Aula' and relation_name == 'aulas_livros':
-                logger.debug(f"Skipping selectinload for {model_cls.__name__}.{relation_name} - known conflict")
+            if model_cls.__name__ == 'Aula' and root_name == 'aulas_livros':
+                logger.debug("Skipping selectinload for %s.%s - known conflict", model_cls.__name__, relation_name)
                 continue
                 
             # Usa selectinload por padrão para relações to-many, que é geralmente mais eficiente
             # Pode ser trocado por joinedload se houver um motivo específico
-            load_options.append(selectinload(relation_attr))
-            logger.debug(f"Adicionando opção de carregamento: selectinload({model_cls.__name__}.{relation_name})")
+            load_option = selectinload(relation_attr)
+            current_model = relation_attr.property.mapper.class_
+            for part in nested_parts:
+                nested_attr = getattr(current_model, part, None)
+                if nested_attr is None or not isinstance(getattr(nested_attr, 'property', None), RelationshipProperty):
+                    load_option = None
+                    break
+                load_option = load_option.selectinload(nested_attr)
+                current_model = nested_attr.property.mapper.class_
+
+            if load_option is None:
+                invalid_includes.append(relation_name)
+                continue
+
+            load_options.append(load_option)
+            logger.debug("Adicionando opção de carregamento: selectinload(%s.%s)", model_cls.__name__, relation_name)
         else:
             invalid_includes.append(relation_name)
 
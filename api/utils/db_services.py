@@ -8,9 +8,10 @@ engine = create_engine(
     DATABASE_URL,
     pool_size=10,            
     max_overflow=40,
-    pool_timeout=360,
+    pool_timeout=30,         # Falha rápido em caso de contenção em vez de segurar a requisição
     pool_recycle=3600,
     pool_pre_ping=True,
+    pool_use_lifo=True,      # Reutiliza as conexões mais recentes (caches do servidor mais "quentes")
     connect_args={"options": "-c timezone=America/Sao_Paulo"}
 )
 
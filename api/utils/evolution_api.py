@@ -1,8 +1,12 @@
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 from decouple import config
 import httpx
+import orjson
+import pybase64
 
 from api.v1._shared.custom_schemas import MensagemZap
 
@@ -10,10 +14,65 @@ from api.v1._shared.custom_schemas import MensagemZap
 EVOLUTIONAPI_URL = config("EVOLUTIONAPI_URL")
 EVOLUTIONAPI_KEY = config("EVOLUTIONAPI_KEY")
 
-# Configuração de logging
-logging.basicConfig(level=logging.INFO)
+# Tamanho dos pedaços lidos ao fazer streaming de mídia
+MEDIA_CHUNK_SIZE = 64 * 1024
+# Início do valor base64 no corpo JSON: chave "base64" (inclusive dentro de "data")
+# ou "media", as mesmas aceitas por extract_media_base64
+_BASE64_FIELD_RE = re.compile(rb'"(?:base64|media)"\s*:\s*"')
+# Bytes mantidos entre chunks para achar a chave dividida entre dois deles
+_BASE64_FIELD_TAIL = 32
+
 logger = logging.getLogger(__name__)
 
+# Cliente HTTP compartilhado: mantém conexões TCP/TLS vivas entre chamadas.
+# As conexões pertencem ao event loop em que foram abertas, então o cliente é
+# recriado se for fechado ou se o loop em execução mudar (ex: asyncio.run por task do Celery)
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Retorna o cliente HTTP do event loop atual, criando-o se necessário"""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        if _client is not None and not _client.is_closed:
+            _fechar_cliente_antigo(_client, _client_loop)
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+            headers={
+                "apikey": EVOLUTIONAPI_KEY,
+                "Content-Type": "application/json"
+            }
+        )
+        _client_loop = loop
+    return _client
+
+
+def _fechar_cliente_antigo(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]):
+    """
+    Fecha o cliente de outro event loop. O aclose precisa rodar no loop dono das
+    conexões; se ele já terminou, os sockets são liberados junto com o cliente.
+    """
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        logger.debug("Event loop do cliente HTTP anterior encerrado, descartando o cliente")
+
+
+async def close_client():
+    """Fecha o cliente HTTP compartilhado (chamar no shutdown da aplicação)"""
+    global _client, _client_loop
+    if _client is not None:
+        if _client_loop is asyncio.get_running_loop():
+            await _client.aclose()
+        else:
+            _fechar_cliente_antigo(_client, _client_loop)
+        _client = None
+        _client_loop = None
+
 
 class EvolutionAPIError(Exception):
     """Exceção customizada para erros da Evolution API"""
@@ -34,7 +93,8 @@ async def get_media_base64(
         convert_to_mp4: Se deve converter áudio para MP4 (opcional, padrão: False)
         
     Returns:
-        Dict contendo os dados da resposta da API
+        Dict contendo os dados da resposta da API (use extract_media_base64
+        para obter o conteúdo)
         
     Raises:
         EvolutionAPIError: Em caso de erro na requisição
@@ -42,11 +102,6 @@ async def get_media_base64(
     try:
         url = f"{EVOLUTIONAPI_URL}/chat/getBase64FromMediaMessage/{instance_name}"
         
-        headers = {
-            "apikey": EVOLUTIONAPI_KEY,
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "message": {
                 "key": {
@@ -59,14 +114,14 @@ async def get_media_base64(
         if convert_to_mp4:
             payload["convertToMp4"] = True
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            
-            response_data = response.json()
-            
-            logger.info(f"Mídia obtida com sucesso para message_id: {message_id}")
-            return response_data
+        response = await _get_client().post(url, json=payload)
+        response.raise_for_status()
+        
+        # orjson lê direto dos bytes, sem decodificar o corpo (com o base64) para str antes
+        response_data = orjson.loads(response.content)
+        
+        logger.debug("Mídia obtida com sucesso para message_id: %s", message_id)
+        return response_data
             
     except httpx.HTTPStatusError as e:
         error_msg = f"Erro HTTP ao obter mídia (Status {e.response.status_code}): {e.response.text}"
@@ -82,6 +137,141 @@ async def get_media_base64(
         raise EvolutionAPIError(error_msg)
 
 
+def extract_media_base64(response_data: Dict[str, Any]) -> str:
+    """
+    Extrai o conteúdo base64 da resposta de get_media_base64, já sem o
+    prefixo data:<mimetype>;base64, se existir.
+    
+    Args:
+        response_data: Resposta da API
+        
+    Returns:
+        str: Conteúdo em base64 (vazio se não encontrado)
+    """
+    media_base64 = (
+        response_data.get("base64")
+        or (response_data.get("data") or {}).get("base64")
+        or response_data.get("media", "")
+    )
+    return media_base64.partition(",")[2] or media_base64
+
+
+async def _decode_base64_field(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Localiza o campo "base64" (ou "media") de um corpo JSON recebido em pedaços e o decodifica
+    de forma incremental, em blocos alinhados a 4 caracteres. O buffer nunca
+    passa de um chunk mais a sobra do bloco anterior.
+    
+    Args:
+        chunks: Pedaços brutos do corpo da resposta
+        
+    Returns:
+        AsyncIterator[bytes]: Blocos já decodificados da mídia
+        
+    Raises:
+        ValueError: Se o campo base64 não for encontrado ou estiver incompleto
+    """
+    buffer = b""
+    inside = False
+    prefix_checked = False
+
+    async for chunk in chunks:
+        buffer += chunk
+
+        if not inside:
+            match = _BASE64_FIELD_RE.search(buffer)
+            if match is None:
+                # Mantém só o suficiente para achar a chave dividida entre dois chunks
+                buffer = buffer[-_BASE64_FIELD_TAIL:]
+                continue
+            buffer = buffer[match.end():]
+            inside = True
+
+        # Remove prefixo data:<mimetype>;base64, se existir
+        if not prefix_checked:
+            if len(buffer) < 5 and b'"' not in buffer:
+                continue
+            if buffer.startswith(b"data:"):
+                comma = buffer.find(b",")
+                if comma == -1:
+                    continue
+                buffer = buffer[comma + 1:]
+            prefix_checked = True
+
+        end = buffer.find(b'"')
+        if end != -1:
+            yield pybase64.b64decode(buffer[:end], validate=False)
+            return
+
+        cut = len(buffer) - len(buffer) % 4
+        if cut:
+            yield pybase64.b64decode(buffer[:cut], validate=False)
+            buffer = buffer[cut:]
+
+    raise ValueError("Base64 não encontrado na resposta da API")
+
+
+async def stream_media_bytes(
+    instance_name: str,
+    message_id: str,
+    convert_to_mp4: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Obtém o conteúdo de mídia da Evolution API já decodificado, em blocos.
+    
+    Diferente de get_media_base64, a resposta não é materializada inteira em
+    memória: o corpo é lido em pedaços e o base64 é decodificado à medida que chega.
+    
+    Args:
+        instance_name: Nome da instância do WhatsApp
+        message_id: ID da mensagem que contém a mídia
+        convert_to_mp4: Se deve converter áudio para MP4 (opcional, padrão: False)
+        
+    Returns:
+        AsyncIterator[bytes]: Blocos binários da mídia
+        
+    Raises:
+        EvolutionAPIError: Em caso de erro na requisição
+        ValueError: Se a resposta não contiver o campo base64
+    """
+    url = f"{EVOLUTIONAPI_URL}/chat/getBase64FromMediaMessage/{instance_name}"
+    
+    payload = {
+        "message": {
+            "key": {
+                "id": message_id
+            }
+        }
+    }
+    
+    if convert_to_mp4:
+        payload["convertToMp4"] = True
+
+    try:
+        async with _get_client().stream("POST", url, json=payload) as response:
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+
+            async for block in _decode_base64_field(response.aiter_bytes(MEDIA_CHUNK_SIZE)):
+                yield block
+
+        logger.debug("Mídia obtida com sucesso para message_id: %s", message_id)
+
+    except httpx.HTTPStatusError as e:
+        error_msg = f"Erro HTTP ao obter mídia (Status {e.response.status_code}): {e.response.text}"
+        logger.error(error_msg)
+        raise EvolutionAPIError(error_msg)
+    except httpx.TimeoutException:
+        error_msg = f"Timeout ao obter mídia para message_id: {message_id}"
+        logger.error(error_msg)
+        raise EvolutionAPIError(error_msg)
+    except httpx.HTTPError as e:
+        error_msg = f"Erro inesperado ao obter mídia: {str(e)}"
+        logger.error(error_msg)
+        raise EvolutionAPIError(error_msg)
+
+
 async def send_text_message(
     instance_name: str,
     phone_number: str,
@@ -104,24 +294,18 @@ async def send_text_message(
     try:
         url = f"{EVOLUTIONAPI_URL}/message/sendText/{instance_name}"
         
-        headers = {
-            "apikey": EVOLUTIONAPI_KEY,
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "number": phone_number,
             "text": text
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            
-            response_data = response.json()
-            
-            logger.info(f"Mensagem de texto enviada com sucesso para: {phone_number}")
-            return response_data
+        response = await _get_client().post(url, json=payload)
+        response.raise_for_status()
+        
+        response_data = orjson.loads(response.content)
+        
+        logger.debug("Mensagem de texto enviada com sucesso para: %s", phone_number)
+        return response_data
             
     except httpx.HTTPStatusError as e:
         error_msg = f"Erro HTTP ao enviar texto (Status {e.response.status_code}): {e.response.text}"
@@ -137,6 +321,39 @@ async def send_text_message(
         raise EvolutionAPIError(error_msg)
 
 
+async def send_text_messages_bulk(
+    instance_name: str,
+    messages: List[Tuple[str, str]],
+    concurrency: int = 10
+) -> List[Union[Dict[str, Any], Exception]]:
+    """
+    Envia várias mensagens de texto em paralelo via Evolution API.
+    
+    As requisições são disparadas com asyncio.gather, limitadas por um
+    semáforo para não sobrecarregar a API.
+    
+    Args:
+        instance_name: Nome da instância do WhatsApp
+        messages: Lista de tuplas (número do destinatário, texto)
+        concurrency: Número máximo de envios simultâneos
+        
+    Returns:
+        Lista na mesma ordem de `messages` com a resposta da API de cada envio.
+        Falhas são retornadas como objetos de exceção (EvolutionAPIError) em vez
+        de serem lançadas, para que um envio com erro não interrompa o lote.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def _send_one(phone_number: str, text: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await send_text_message(instance_name, phone_number, text)
+    
+    return await asyncio.gather(
+        *(_send_one(phone_number, text) for phone_number, text in messages),
+        return_exceptions=True
+    )
+
+
 async def send_media_message(
     instance_name: str,
     phone_number: str,
@@ -165,11 +382,6 @@ async def send_media_message(
     try:
         url = f"{EVOLUTIONAPI_URL}/message/sendMedia/{instance_name}"
         
-        headers = {
-            "apikey": EVOLUTIONAPI_KEY,
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "number": phone_number,
             "mediaMessage": {
@@ -183,14 +395,13 @@ async def send_media_message(
         if caption:
             payload["mediaMessage"]["caption"] = caption
         
-        async with httpx.AsyncClient(timeout=60.0) as client:  # Timeout maior para mídia
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            
-            response_data = response.json()
-            
-            logger.info(f"Mensagem de mídia ({media_type}) enviada com sucesso para: {phone_number}")
-            return response_data
+        response = await _get_client().post(url, json=payload, timeout=60.0)  # Timeout maior para mídia
+        response.raise_for_status()
+        
+        response_data = orjson.loads(response.content)
+        
+        logger.debug("Mensagem de mídia (%s) enviada com sucesso para: %s", media_type, phone_number)
+        return response_data
             
     except httpx.HTTPStatusError as e:
         error_msg = f"Erro HTTP ao enviar mídia (Status {e.response.status_code}): {e.response.text}"
@@ -278,8 +489,8 @@ async def enviar_resposta_whatsapp(mensagem: MensagemZap, resposta_texto: str):
             phone_number=mensagem.telefone_remetente,
             text=resposta_texto
         )
-        logger.info(f"Resposta enviada com sucesso para {mensagem.telefone_remetente}")
+        logger.debug("Resposta enviada com sucesso para %s", mensagem.telefone_remetente)
     except EvolutionAPIError as e:
-        logger.error(f"Erro ao enviar resposta via Evolution API: {e}")
+        logger.error("Erro ao enviar resposta via Evolution API: %s", e)
     except Exception as e:
-        logger.error(f"Erro inesperado ao enviar resposta: {e}")
\ No newline at end of file
+        logger.error("Erro inesperado ao enviar resposta: %s", e)
\ No newline at end of file
@@ -1,5 +1,14 @@
+from functools import lru_cache
+
 from fastapi import HTTPException, status
 
+# Sufixo de gênero de "encontrad_" pela última letra da entidade (padrão: "o")
+_SUFFIX = {'a': 'a'}
+
+@lru_cache(maxsize=256)
+def _not_found_detail(entity: str) -> str:
+    return f"{entity} não encontrad{_SUFFIX.get(entity[-1:], 'o')}"
+
 class ExceptionNotFound(HTTPException):
     def __init__(self, detail: str = "Não encontrado"):
         super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
@@ -42,7 +51,7 @@ class ExceptionInvalidData(HTTPException):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 class ExceptionCustomNotFound(HTTPException):
     def __init__(self, entity: str):
-        super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=f"{entity} não encontrad{entity[-1] == 'a' and 'a' or 'o'}")
+        super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=_not_found_detail(entity))
         
 class ExceptionConflict(HTTPException):
     def __init__(self, detail: str = "Conflito"):
@@ -54,7 +63,7 @@ class CSVValidationError(HTTPException):
 
 def exception_nao_encontrado(entity: str):
     return HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND, detail=f"{entity} não encontrad{entity[-1] == 'a' and 'a' or 'o'}"
+        status_code=status.HTTP_404_NOT_FOUND, detail=_not_found_detail(entity)
     )
     
 def exception_nao_autorizado():
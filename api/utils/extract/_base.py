@@ -0,0 +1,166 @@
+"""
+Download de mídias da EvolutionAPI compartilhado pelos extratores de texto
+(áudio, imagem e PDF), com o mesmo tratamento de erros para os três, e
+coalescência de extrações concorrentes da mesma mídia.
+"""
+
+import asyncio
+import binascii
+from contextlib import contextmanager
+import logging
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, TypeVar
+
+from api.utils.evolution_api import (
+    EvolutionAPIError,
+    extract_media_base64,
+    get_media_base64,
+    stream_media_bytes,
+)
+from api.utils.utils_file import cleanup_temp_file
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Extrações em andamento, por chave da mídia
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+class _LiderCancelado(Exception):
+    """Sinaliza aos seguidores que a extração líder foi cancelada e deve ser refeita"""
+
+
+async def single_flight(key: str, func: Callable[[], Awaitable[T]]) -> T:
+    """
+    Garante que só uma extração por chave rode ao mesmo tempo no processo.
+    Chamadas concorrentes com a mesma chave aguardam e recebem o mesmo
+    resultado (ou exceção) da primeira, em vez de repetir download e IA.
+    Se a primeira for cancelada, um dos seguidores assume a extração.
+
+    Args:
+        key: Identificador da mídia (ex: "pdf:<instância>:<message_id>")
+        func: Função que executa a extração
+
+    Returns:
+        Resultado de func
+    """
+    while True:
+        future = _inflight.get(key)
+        if future is None:
+            break
+        logger.debug("Aguardando extração em andamento: %s", key)
+        try:
+            return await asyncio.shield(future)
+        except _LiderCancelado:
+            logger.debug("Extração líder cancelada, assumindo: %s", key)
+
+    future = asyncio.get_running_loop().create_future()
+    # Marca a exceção como consumida mesmo que ninguém mais esteja aguardando
+    future.add_done_callback(lambda f: f.exception())
+    _inflight[key] = future
+    try:
+        result = await func()
+    except asyncio.CancelledError:
+        # Não propaga o cancelamento aos seguidores: eles refazem a extração
+        future.set_exception(_LiderCancelado(key))
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
+@contextmanager
+def _download_errors(label: str):
+    """Converte falhas do download em Exception com mensagem padronizada para a mídia"""
+    try:
+        yield
+    except EvolutionAPIError as e:
+        logger.error("Erro HTTP ao buscar mídia: %s", e)
+        raise Exception(f"Erro ao baixar {label} da EvolutionAPI: {e}")
+    except binascii.Error as e:
+        logger.error("Erro ao decodificar base64: %s", e)
+        raise Exception(f"Erro ao decodificar {label}: {e}")
+    except Exception as e:
+        logger.error("Erro inesperado ao processar %s: %s", label, e)
+        raise Exception(f"Erro ao processar {label}: {str(e)}")
+
+
+async def download_media(instance_name: str, message_id: str, label: str) -> bytes:
+    """
+    Baixa a mídia e retorna o conteúdo decodificado em memória.
+
+    Args:
+        instance_name: Nome da instância
+        message_id: ID da mensagem
+        label: Nome da mídia usado nas mensagens de erro (ex: "PDF")
+
+    Returns:
+        bytes: Conteúdo binário da mídia
+    """
+    with _download_errors(label):
+        # Faz streaming da mídia, decodificando o base64 à medida que chega
+        media_bytes = b"".join([block async for block in stream_media_bytes(instance_name, message_id)])
+        logger.info("%s baixado com sucesso: %d bytes", label, len(media_bytes))
+        return media_bytes
+
+
+async def download_media_to_file(
+    instance_name: str,
+    message_id: str,
+    file_path: Path,
+    label: str,
+    *,
+    convert_to_mp4: bool = False
+) -> Path:
+    """
+    Baixa a mídia direto para um arquivo, sem manter o conteúdo inteiro em memória.
+    Se o download falhar, o arquivo parcial é removido.
+
+    Args:
+        instance_name: Nome da instância
+        message_id: ID da mensagem
+        file_path: Caminho de destino
+        label: Nome da mídia usado nas mensagens de erro (ex: "áudio")
+        convert_to_mp4: Se a EvolutionAPI deve converter a mídia para MP4
+
+    Returns:
+        Path: Caminho do arquivo salvo
+    """
+    try:
+        with _download_errors(label):
+            with open(file_path, "wb") as media_file:
+                async for block in stream_media_bytes(instance_name, message_id, convert_to_mp4=convert_to_mp4):
+                    media_file.write(block)
+    except Exception:
+        cleanup_temp_file(file_path, "após erro")
+        raise
+
+    logger.info("Arquivo salvo com sucesso: %s", file_path)
+    return file_path
+
+
+async def download_media_base64(instance_name: str, message_id: str, label: str) -> str:
+    """
+    Baixa a mídia e retorna o base64 sem decodificar (sem prefixo data:).
+    Útil quando o destino também recebe base64, como o OpenAI Vision.
+
+    Args:
+        instance_name: Nome da instância
+        message_id: ID da mensagem
+        label: Nome da mídia usado nas mensagens de erro (ex: "imagem")
+
+    Returns:
+        str: Conteúdo da mídia em base64
+    """
+    with _download_errors(label):
+        media_b64 = extract_media_base64(await get_media_base64(instance_name, message_id))
+        if not media_b64:
+            raise ValueError("Base64 não encontrado na resposta da API")
+        logger.info("%s baixado com sucesso: %d caracteres base64", label, len(media_b64))
+        return media_b64
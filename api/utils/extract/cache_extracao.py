@@ -0,0 +1,117 @@
+"""
+Cache de resultados de extração de texto (visão, áudio e PDF) no Redis.
+
+As entradas são indexadas pelo SHA-256 do conteúdo da mídia, de modo que
+imagens, áudios e PDFs repetidos (encaminhamentos, reenvios) não voltam a
+passar pela OpenAI nem pelo parser.
+"""
+
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Optional
+
+import redis
+
+from api.utils.redis_db import EXT_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# Tempo de vida das entradas de cache (24h)
+EXTRACAO_CACHE_TTL = 86400
+
+# Cliente criado só no primeiro uso: o pool conecta sob demanda e reconecta
+# sozinho, então um Redis fora do ar no import não desativa o cache para sempre
+_redis_client: Optional[redis.Redis] = None
+_redis_client_lock = threading.Lock()
+
+
+def _get_client() -> Optional[redis.Redis]:
+    """Retorna o cliente Redis compartilhado, ou None se REDIS_URL não estiver definida"""
+    global _redis_client
+    if _redis_client is None:
+        with _redis_client_lock:
+            if _redis_client is None:
+                redis_url = os.getenv("REDIS_URL")
+                if not redis_url:
+                    return None
+                _redis_client = redis.from_url(redis_url, decode_responses=True)
+                atexit.register(_redis_client.close)
+    return _redis_client
+
+
+def _ext_key(tipo: str, digest: str) -> str:
+    return f"{EXT_PREFIX}{tipo}:{digest}"
+
+
+def _get_sync(tipo: str, digest: str) -> Optional[dict]:
+    client = _get_client()
+    if client is None:
+        return None
+    try:
+        raw = client.get(_ext_key(tipo, digest))
+    except redis.RedisError as e:
+        logger.warning("Erro ao consultar cache de extração: %s", e)
+        return None
+    return json.loads(raw) if raw else None
+
+
+def _set_sync(tipo: str, digest: str, data: dict) -> bool:
+    client = _get_client()
+    if client is None:
+        return False
+    try:
+        client.setex(_ext_key(tipo, digest), EXTRACAO_CACHE_TTL, json.dumps(data, ensure_ascii=False))
+        return True
+    except redis.RedisError as e:
+        logger.warning("Erro ao gravar cache de extração: %s", e)
+        return False
+
+
+def media_digest(data: bytes, *contexto: str) -> str:
+    """
+    Calcula a chave de cache de uma mídia.
+
+    Args:
+        data: Conteúdo binário da mídia
+        contexto: Valores adicionais que alteram o resultado (ex: legenda da imagem)
+
+    Returns:
+        str: SHA-256 em hexadecimal
+    """
+    digest = hashlib.sha256(data)
+    for valor in contexto:
+        digest.update(b"\0" + valor.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def file_media_digest(file_path) -> str:
+    """
+    Calcula a chave de cache de uma mídia salva em disco, sem carregá-la inteira.
+
+    Args:
+        file_path: Caminho para o arquivo
+
+    Returns:
+        str: SHA-256 em hexadecimal
+    """
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+async def get_cached_extraction(tipo: str, digest: str) -> Optional[dict]:
+    """Retorna o resultado em cache para a mídia, ou None se não houver."""
+    # O cliente Redis é síncrono: roda em thread para não bloquear o event loop
+    cached = await asyncio.to_thread(_get_sync, tipo, digest)
+    if cached is not None:
+        logger.debug("Cache de extração encontrado: %s:%s", tipo, digest)
+    return cached
+
+
+async def set_cached_extraction(tipo: str, digest: str, data: dict) -> bool:
+    """Armazena o resultado da extração da mídia por EXTRACAO_CACHE_TTL segundos."""
+    return await asyncio.to_thread(_set_sync, tipo, digest, data)
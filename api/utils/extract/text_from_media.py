@@ -0,0 +1,48 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Iterable, List, Tuple, Union
+
+from api.utils.extract.text_from_audio import text_from_audio
+from api.utils.extract.text_from_image import extract_text_from_image
+from api.utils.extract.text_from_pdf import extract_text_from_pdf
+from api.v1._shared.custom_schemas import MensagemZap
+
+logger = logging.getLogger(__name__)
+
+# Extrator responsável por cada tipo de mídia
+MEDIA_EXTRACTORS: Dict[str, Callable[[MensagemZap], Awaitable[str]]] = {
+    "audio": text_from_audio,
+    "imagem": extract_text_from_image,
+    "pdf": extract_text_from_pdf,
+}
+
+
+async def extract_texts_from_media(
+    itens: Iterable[Tuple[str, MensagemZap]]
+) -> List[Union[str, BaseException]]:
+    """
+    Extrai o texto de várias mídias de uma mesma mensagem em paralelo.
+
+    Cada extração depende de rede (Evolution API e OpenAI), então o tempo total
+    passa a ser o da mídia mais lenta, e não a soma de todas.
+
+    Args:
+        itens: Pares (tipo da mídia, mensagem), com tipo em MEDIA_EXTRACTORS
+
+    Returns:
+        List: Texto extraído de cada item, na mesma ordem. Falhas aparecem como
+        objetos de exceção na lista, sem interromper as demais extrações.
+
+    Raises:
+        ValueError: Se algum tipo de mídia não for suportado
+    """
+    itens = list(itens)
+    # Valida tudo antes de criar as corrotinas, para não deixar nenhuma sem await
+    for tipo, _ in itens:
+        if tipo not in MEDIA_EXTRACTORS:
+            raise ValueError(f"Tipo de mídia não suportado: '{tipo}'. Válidos: {list(MEDIA_EXTRACTORS)}")
+
+    tarefas = [MEDIA_EXTRACTORS[tipo](mensagem) for tipo, mensagem in itens]
+
+    logger.debug("Extraindo texto de %d mídias em paralelo", len(tarefas))
+    return await asyncio.gather(*tarefas, return_exceptions=True)
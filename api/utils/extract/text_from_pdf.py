@@ -1,113 +1,81 @@
-import base64
+import asyncio
 import logging
-from pathlib import Path
 
-import PyPDF2
+import pypdfium2 as pdfium
 
-from api.utils.evolution_api import EvolutionAPIError, get_media_base64
-from api.utils.utils_file import cleanup_temp_file
+from api.utils.extract._base import download_media, single_flight
+from api.utils.extract.cache_extracao import get_cached_extraction, media_digest, set_cached_extraction
 from api.v1._shared.constants import (
     MESSAGE_TYPE_ARQUIVO_MUITO_LONGO,
     MESSAGE_TYPE_PDF_ERROR,
 )
 from api.v1._shared.custom_schemas import MensagemZap
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Limite de páginas aceito para extração
+PDF_MAX_PAGES = 2
 
-async def _baixa_pdf(instance_name, message_id) -> str:
-    try:        
-        # Usa o método centralizado da Evolution API
-        response_data = await get_media_base64(instance_name, message_id)
-            
-        # Assume que o base64 está em response_data["base64"] ou similar
-        # Ajuste conforme a estrutura real da resposta da API
-        if "base64" in response_data:
-            pdf_base64 = response_data["base64"]
-        elif "data" in response_data and "base64" in response_data["data"]:
-            pdf_base64 = response_data["data"]["base64"]
-        else:
-            # Se não encontrar o base64, use a resposta completa
-            pdf_base64 = response_data.get("media", response_data.get("base64", ""))
-        
-        if not pdf_base64:
-            raise ValueError("Base64 não encontrado na resposta da API")
-        
-        # Remove prefixo data:application/pdf;... se existir
-        if "," in pdf_base64:
-            pdf_base64 = pdf_base64.split(",")[1]
-        
-        # Decodifica o base64
-        pdf_bytes = base64.b64decode(pdf_base64)
-        
-        # Cria a pasta temp se não existir
-        temp_dir = Path("temp")
-        temp_dir.mkdir(exist_ok=True)
-        
-        # Define o nome do arquivo
-        filename = f"{instance_name}_{message_id}.pdf"
-        file_path = temp_dir / filename
-        
-        # Salva o arquivo PDF
-        with open(file_path, "wb") as pdf_file:
-            pdf_file.write(pdf_bytes)
-        
-        logger.info(f"Arquivo PDF salvo com sucesso: {file_path}")
-        
-        return str(file_path)
-            
-    except EvolutionAPIError as e:
-        logger.error(f"Erro HTTP ao buscar mídia: {e}")
-        raise Exception(f"Erro ao baixar PDF da EvolutionAPI: {e}")
-    except base64.binascii.Error as e:
-        logger.error(f"Erro ao decodificar base64: {e}")
-        raise Exception(f"Erro ao decodificar PDF: {e}")
-    except Exception as e:
-        logger.error(f"Erro inesperado ao processar PDF: {e}")
-        raise Exception(f"Erro ao processar PDF: {str(e)}")
 
-def _extract_text_from_pdf_file(file_path: str) -> tuple[str, int]:
+def _extract_text_from_pdf_file(pdf_bytes: bytes) -> tuple[str, int]:
     """
-    Extrai texto de um arquivo PDF e retorna o texto e número de páginas.
+    Extrai texto de um PDF em memória e retorna o texto e número de páginas.
     
     Args:
-        file_path: Caminho para o arquivo PDF
+        pdf_bytes: Conteúdo binário do PDF
         
     Returns:
         tuple: (texto_extraido, numero_de_paginas)
     """
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            num_pages = len(pdf_reader.pages)
+        # PDFium (C++) lê direto dos bytes em memória
+        pdf = pdfium.PdfDocument(pdf_bytes)
+        try:
+            # len() só consulta a árvore de páginas (via xref); nenhum conteúdo
+            # de página é carregado antes da checagem de limite abaixo
+            num_pages = len(pdf)
             
-            # Se tem mais que 2 páginas, retorna mensagem especial
-            if num_pages > 2:
+            # Se passa do limite de páginas, retorna mensagem especial
+            if num_pages > PDF_MAX_PAGES:
                 return MESSAGE_TYPE_ARQUIVO_MUITO_LONGO, num_pages
             
-            # Extrai texto de todas as páginas (máximo 2)
-            text = ""
+            # Extrai texto de todas as páginas
+            texts = []
             for page_num in range(num_pages):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text() + "\n"
+                page = pdf[page_num]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_bounded())
+                textpage.close()
+                page.close()
             
-            return text.strip(), num_pages
+            return "\n".join(texts).strip(), num_pages
+        finally:
+            pdf.close()
             
     except Exception as e:
         logger.error(f"Erro ao extrair texto do PDF: {e}")
         raise Exception(f"Erro ao processar conteúdo do PDF: {str(e)}")
 
 async def extract_text_from_pdf(mensagem: MensagemZap) -> str:    
+    # A mesma mensagem recebida em paralelo é processada uma única vez
+    key = f"pdf:{mensagem.nome_instancia}:{mensagem.message_id}"
+    return await single_flight(key, lambda: _extract_text_from_pdf(mensagem))
+
+async def _extract_text_from_pdf(mensagem: MensagemZap) -> str:
 
     response = ""
 
     try:
-        file_path = await _baixa_pdf(mensagem.nome_instancia, mensagem.message_id)
-        logger.info(f"PDF salvo em: {file_path}")
+        pdf_bytes = await download_media(mensagem.nome_instancia, mensagem.message_id, "PDF")
         
-        # Extrai o texto do PDF
-        extracted_text = _extract_text_from_pdf_file(file_path)
+        digest = media_digest(pdf_bytes)
+        cached = await get_cached_extraction("pdf", digest)
+        if cached is not None:
+            extracted_text = (cached["text"], cached["num_pages"])
+        else:
+            # Extrai o texto do PDF em uma thread para não bloquear o event loop
+            extracted_text = await asyncio.to_thread(_extract_text_from_pdf_file, pdf_bytes)
+            await set_cached_extraction("pdf", digest, {"text": extracted_text[0], "num_pages": extracted_text[1]})
         
         logger.info(f"Extração de texto concluída ")
         response = extracted_text
@@ -116,5 +84,4 @@ async def extract_text_from_pdf(mensagem: MensagemZap) -> str:
         logger.error(f"Erro ao processar PDF: {e}")
         response = MESSAGE_TYPE_PDF_ERROR
         
-    cleanup_temp_file(file_path)
     return response
\ No newline at end of file
@@ -1,62 +1,128 @@
+import asyncio
+import io
+import json
 import logging
-import os
 from pathlib import Path
 import shutil
+import struct
 import subprocess
-import tempfile
 import time
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
-from decouple import config
-from openai import OpenAI
-
+from api.utils.ia.openai_client import get_async_openai_client, get_openai_client
 from api.v1._shared.custom_schemas import TranscriptionResult
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 MODEL = "whisper-1" 
 LANGUAGE = "pt"
-OPENAI_API_KEY = config("OPENAI_API_KEY")
+# Estimativa de tokens da transcrição: 175 tokens por minuto de áudio
+TOKENS_PER_SECOND = 175 / 60
+
+# Detecção de silêncio aplicada na extração: remove o silêncio inicial e
+# também as pausas de mais de 1s no meio do áudio, que seriam cobradas pelo
+# Whisper por minuto sem conter fala (aulas e reuniões costumam ter muitas)
+SILENCE_FILTER = (
+    "silenceremove="
+    "start_periods=1:start_threshold=-50dB:"
+    "stop_periods=-1:stop_duration=1:stop_threshold=-50dB"
+)
+
+# Áudios que podem ser enviados ao Whisper sem passar pelo ffmpeg
+PASSTHROUGH_CODECS = frozenset({"aac", "mp3", "opus"})
+# Nome de upload por formato de container informado pelo ffprobe
+PASSTHROUGH_FORMATS = {"mp4": "audio.mp4", "ogg": "audio.ogg", "mp3": "audio.mp3", "webm": "audio.webm"}
+# Limite de tamanho de arquivo da API de transcrição
+WHISPER_MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+
+# Máximo de chamadas simultâneas ao Whisper em transcribe_many_async
+TRANSCRIPTION_MAX_CONCURRENCY = 8
+
+@lru_cache(maxsize=None)
+def _tool_path(name: str) -> str:
+    """Caminho absoluto do executável (ffmpeg/ffprobe), resolvido uma vez por processo"""
+    return shutil.which(name) or name
 
-def analyze_audio_quality(audio_path: str) -> dict:
+def _run_tool(cmd: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """
+    Executa ffmpeg/ffprobe pelo caminho rápido de criação de processo.
+    
+    O subprocess só usa posix_spawn (sem fork e sem copiar a tabela de páginas
+    do worker) quando o executável tem caminho absoluto e close_fds=False.
+    Os descritores do Python já são não herdáveis por padrão (PEP 446), então
+    o filho não recebe sockets nem arquivos abertos do servidor.
+    """
+    return subprocess.run([_tool_path(cmd[0]), *cmd[1:]], close_fds=False, **kwargs)
+
+def _probe(audio_path) -> dict:
+    """
+    Executa o ffprobe uma única vez e retorna formato e streams do arquivo.
+    
+    Args:
+        audio_path: Caminho para o arquivo de áudio
+        
+    Returns:
+        dict: Saída JSON do ffprobe (chaves "format" e "streams"), ou {} em caso de erro
+    """
+    probe_cmd = [
+        "ffprobe",
+        "-v", "quiet",
+        "-print_format", "json",
+        "-show_format",
+        "-show_streams",
+        str(audio_path)
+    ]
+    
+    try:
+        result = _run_tool(probe_cmd, capture_output=True, check=True)
+        return json.loads(result.stdout or b"{}")
+    except (subprocess.CalledProcessError, ValueError) as e:
+        logger.warning(f"Não foi possível executar ffprobe: {e}")
+        return {}
+
+def _probe_duration(probe: dict) -> float:
+    """Retorna a duração total do arquivo informada pelo ffprobe, ou 0.0"""
+    try:
+        return float(probe.get("format", {}).get("duration") or 0.0)
+    except ValueError:
+        return 0.0
+
+def analyze_audio_quality(audio_path: str, probe: Optional[dict] = None) -> dict:
     """
     Analisa a qualidade do áudio antes da transcrição para otimizar o processamento.
     
     Args:
         audio_path: Caminho para o arquivo de áudio
+        probe: Resultado de _probe já obtido para o arquivo (evita novo ffprobe)
         
     Returns:
         dict: Informações sobre a qualidade e características do áudio
     """
     try:
-        # Comando para análise detalhada do áudio
-        analysis_cmd = [
-            "ffprobe",
-            "-v", "quiet",
-            "-select_streams", "a:0",
-            "-show_entries", "stream=sample_rate,channels,duration,bit_rate:format=duration",
-            "-of", "csv=p=0",
-            str(audio_path)
-        ]
+        if probe is None:
+            probe = _probe(audio_path)
         
-        result = subprocess.run(analysis_cmd, capture_output=True, text=True, check=True)
-        
-        # Parse das informações (formato: sample_rate,channels,duration,bit_rate,total_duration)
-        parts = result.stdout.strip().split(',')
+        # Primeiro stream de áudio do arquivo
+        stream = next(
+            (s for s in probe.get("streams", []) if s.get("codec_type") == "audio"),
+            None
+        )
         
-        if len(parts) >= 4:
-            sample_rate = int(parts[0]) if parts[0] else 0
-            channels = int(parts[1]) if parts[1] else 0
-            duration = float(parts[2]) if parts[2] else 0
-            bit_rate = int(parts[3]) if parts[3] else 0
+        if stream is not None:
+            sample_rate = int(stream.get("sample_rate") or 0)
+            channels = int(stream.get("channels") or 0)
+            duration = float(stream.get("duration") or 0)
+            bit_rate = int(stream.get("bit_rate") or 0)
             
             # Calcula qualidade estimada
-            quality_score = 0
-            if sample_rate >= 16000: quality_score += 25
-            if sample_rate >= 22050: quality_score += 15
-            if sample_rate >= 44100: quality_score += 10
-            if channels >= 1: quality_score += 20
-            if bit_rate >= 128000: quality_score += 30
+            quality_score = (
+                25 * (sample_rate >= 16000)
+                + 15 * (sample_rate >= 22050)
+                + 10 * (sample_rate >= 44100)
+                + 20 * (channels >= 1)
+                + 30 * (bit_rate >= 128000)
+            )
             
             return {
                 "sample_rate": sample_rate,
@@ -81,6 +147,39 @@ def analyze_audio_quality(audio_path: str) -> dict:
         "recommended_processing": True
     }
 
+def _stderr_text(error: subprocess.CalledProcessError) -> str:
+    """Retorna o stderr do ffmpeg como texto (a saída é capturada em bytes por causa do WAV no stdout)"""
+    if not error.stderr:
+        return ""
+    return error.stderr.decode("utf-8", errors="replace")
+
+def wav_duration(wav_bytes: bytes) -> float:
+    """
+    Calcula a duração de um WAV PCM gerado pelo ffmpeg em memória.
+
+    Quando a saída vai para um pipe, o ffmpeg não consegue voltar e preencher
+    os tamanhos no cabeçalho, então a duração é obtida pelo tamanho real dos
+    dados dividido pela taxa de bytes declarada no chunk "fmt ".
+
+    Args:
+        wav_bytes: Conteúdo do arquivo WAV
+
+    Returns:
+        float: Duração em segundos (0.0 se o cabeçalho não puder ser lido)
+    """
+    byte_rate = 0
+    offset = 12  # Pula "RIFF", tamanho e "WAVE"
+    while offset + 8 <= len(wav_bytes):
+        chunk_id = wav_bytes[offset:offset + 4]
+        chunk_size = struct.unpack_from("<I", wav_bytes, offset + 4)[0]
+        if chunk_id == b"fmt ":
+            byte_rate = struct.unpack_from("<I", wav_bytes, offset + 16)[0]
+        elif chunk_id == b"data":
+            data_size = len(wav_bytes) - (offset + 8)
+            return data_size / byte_rate if byte_rate else 0.0
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return 0.0
+
 def check_ffmpeg_installation():
     """
     Verifica se ffmpeg e ffprobe estão instalados e disponíveis no PATH.
@@ -111,27 +210,108 @@ def check_ffmpeg_installation():
         """
         raise RuntimeError(f"Ferramentas não encontradas: {', '.join(missing_tools)}\n{install_instructions}")
 
-def transcribe_mp4_to_text(video_path: str) -> TranscriptionResult:
+def _extract_wav(video_path: Path) -> bytes:
     """
-    Extrai o áudio de um MP4 e transcreve com OpenAI, retornando objeto com detalhes.
-    Requer: OPENAI_API_KEY no ambiente e ffmpeg instalado no PATH.
+    Extrai o áudio em WAV mono 16kHz em uma única passada do ffmpeg.
+    O WAV é escrito no stdout (pipe:1) e mantido em memória, sem arquivo temporário.
     
     Args:
         video_path: Caminho para o arquivo MP4
         
     Returns:
-        TranscriptionResult: Objeto com texto, tokens utilizados, modelo e duração
+        bytes: Conteúdo do WAV
     """
-    video_path = Path(video_path)
-    if not video_path.exists():
-        raise FileNotFoundError(f"Arquivo não encontrado: {video_path}")
+    ffmpeg_cmd = [
+        "ffmpeg",
+        "-err_detect", "ignore_err",  # tolera frames corrompidos em vez de abortar
+        "-i", str(video_path),
+        "-vn",  # remove streams de vídeo
+        "-ac", "1",  # mono (reduz tamanho em ~50%)
+        # Remove silêncios e reamostra para 16kHz (otimizado para fala humana)
+        "-af", f"{SILENCE_FILTER},aresample=16000",
+        "-acodec", "pcm_s16le",  # codec WAV sem perda
+        "-f", "wav", "pipe:1",
+    ]
+    
+    logger.info("Extraindo áudio do MP4...")
+    extraction_start = time.time()
+    
+    try:
+        result = _run_tool(ffmpeg_cmd, capture_output=True, check=True)
+        logger.info("✅ Extração bem-sucedida")
+        
+    except subprocess.CalledProcessError as e:
+        stderr = _stderr_text(e)
+        # Só vale tentar de novo se o problema for o filtro; falhas de
+        # decodificação se repetiriam em qualquer outro comando
+        if "No such filter" not in stderr:
+            raise
+        
+        logger.warning(f"❌ Filtro indisponível no ffmpeg, extraindo sem filtro: {stderr}")
+        ffmpeg_cmd_minimal = [
+            "ffmpeg", "-i", str(video_path), 
+            "-vn", "-ac", "1", "-ar", "16000",
+            "-acodec", "pcm_s16le", "-f", "wav", "pipe:1"
+        ]
+        result = _run_tool(ffmpeg_cmd_minimal, capture_output=True, check=True)
+        logger.info("✅ Extração sem filtro bem-sucedida")
+    
+    extraction_time = time.time() - extraction_start
+    logger.info(f"Extração concluída em {extraction_time:.2f}s")
+    
+    audio_wav = result.stdout
+    # Verifica se o WAV foi gerado (44 bytes = só o cabeçalho)
+    if len(audio_wav) <= 44:
+        raise RuntimeError("Falha na extração de áudio - arquivo WAV vazio ou não criado")
+    return audio_wav
 
+def _passthrough_upload_name(video_path: Path, probe: dict) -> Optional[str]:
+    """
+    Verifica se o arquivo original já serve para o Whisper sem reprocessar:
+    só um stream de áudio, mono, até 16kHz, em codec comprimido aceito pela
+    API e dentro do limite de upload.
+    
+    Returns:
+        str: Nome do arquivo para upload (a extensão define o formato), ou None
+        se for preciso extrair com ffmpeg
+    """
+    streams = probe.get("streams", [])
+    if len(streams) != 1 or streams[0].get("codec_type") != "audio":
+        return None
+    
+    stream = streams[0]
+    if stream.get("codec_name") not in PASSTHROUGH_CODECS:
+        return None
+    if int(stream.get("channels") or 0) != 1 or not 0 < int(stream.get("sample_rate") or 0) <= 16000:
+        return None
+    if video_path.stat().st_size >= WHISPER_MAX_UPLOAD_BYTES:
+        return None
+    
+    format_names = set(probe.get("format", {}).get("format_name", "").split(","))
+    for format_name, upload_name in PASSTHROUGH_FORMATS.items():
+        if format_name in format_names:
+            return upload_name
+    return None
+
+def _prepare_audio(video_path: Path) -> Tuple[bytes, str, float, float]:
+    """
+    Analisa o arquivo e extrai o áudio que será enviado ao Whisper.
+    Se o arquivo original já estiver em formato adequado, é enviado como está.
+    
+    Args:
+        video_path: Caminho para o arquivo MP4
+        
+    Returns:
+        Tuple: (áudio em memória, nome do arquivo para upload, duração original,
+        duração após processamento), com as durações em segundos
+    """
     # Verifica se ferramentas estão instaladas
     check_ffmpeg_installation()
 
     # Análise prévia da qualidade do áudio
     logger.info(f"Analisando qualidade do arquivo: {video_path}")
-    audio_quality = analyze_audio_quality(video_path)
+    probe = _probe(video_path)
+    audio_quality = analyze_audio_quality(video_path, probe)
     
     logger.info(f"Qualidade do áudio original:")
     logger.info(f"  - Sample Rate: {audio_quality['sample_rate']} Hz")
@@ -143,218 +323,202 @@ def transcribe_mp4_to_text(video_path: str) -> TranscriptionResult:
     if not audio_quality['is_suitable']:
         logger.warning("Qualidade do áudio pode resultar em transcrição imprecisa")
 
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    logger.info(f"Iniciando processamento otimizado de: {video_path}")
+    
+    # Duração do arquivo original, do mesmo ffprobe usado na análise
+    duration_seconds = _probe_duration(probe)
+    if duration_seconds:
+        logger.info(f"Duração do arquivo: {duration_seconds:.2f} segundos")
+    else:
+        logger.warning("Não foi possível obter duração do arquivo")
+
+    upload_name = _passthrough_upload_name(video_path, probe)
+    if upload_name is not None:
+        # Áudio já compatível: evita decodificar e reamostrar com ffmpeg
+        logger.info(f"Áudio já adequado para transcrição, enviando original como {upload_name}")
+        return video_path.read_bytes(), upload_name, duration_seconds, duration_seconds
+
+    audio_wav = _extract_wav(video_path)
+
+    # Calcula duração FINAL do áudio processado, direto do tamanho do PCM
+    final_duration = wav_duration(audio_wav) or duration_seconds
+    
+    if final_duration != duration_seconds and duration_seconds > 0:
+        economy_percent = ((duration_seconds - final_duration) / duration_seconds) * 100
+        logger.info(f"Duração após processamento: {final_duration:.2f}s (original: {duration_seconds:.2f}s)")
+        logger.info(f"Economia: {economy_percent:.1f}%")
+    else:
+        logger.info(f"Duração do áudio: {final_duration:.2f}s")
+
+    return audio_wav, "audio.wav", duration_seconds, final_duration
+
+def _transcription_params(audio_data: bytes, upload_name: str) -> dict:
+    """Monta os parâmetros da chamada ao Whisper (mesmos para o cliente síncrono e o assíncrono)"""
+    # O nome do buffer define o formato do arquivo enviado à OpenAI
+    audio_file = io.BytesIO(audio_data)
+    audio_file.name = upload_name
+    return dict(
+        model=MODEL,
+        file=audio_file,
+        language=LANGUAGE,  # Especificar idioma melhora precisão
+        response_format="text",  # Só o texto é usado; evita gerar e validar segmentos
+        
+        # PARÂMETROS OTIMIZADOS para maior precisão:
+        temperature=0.0,  # Determinístico (mais assertivo, menos criativo)
+        
+        # Prompt inicial para melhorar contexto (português brasileiro)
+        prompt="Este é um áudio em português brasileiro. Transcreva com pontuação adequada e formatação correta."
+    )
+
+def _build_result(
+    result,
+    duration_seconds: float,
+    final_duration: float,
+    transcription_time: float
+) -> TranscriptionResult:
+    """
+    Converte a resposta do Whisper em TranscriptionResult, registrando as métricas de qualidade.
+    
+    Args:
+        result: Resposta da API de transcrição (texto puro)
+        duration_seconds: Duração do arquivo original
+        final_duration: Duração do áudio enviado (após remoção de silêncios)
+        transcription_time: Tempo gasto na chamada à API
+        
+    Returns:
+        TranscriptionResult: Objeto com texto, tokens utilizados, modelo e duração
+    """
+    # Com response_format="text" a API retorna a própria string
+    transcription_text = result if isinstance(result, str) else result.text
+    
+    # Calcula tokens baseado na duração OTIMIZADA (pós-processamento)
+    # Usar a duração final (após remoção de silêncios) para cálculo mais preciso
+    estimated_tokens = int(final_duration * TOKENS_PER_SECOND)
+    
+    # Análise de qualidade da transcrição
+    if not transcription_text.strip():
+        logger.warning("Transcrição retornou texto vazio")
+        transcription_text = "[Áudio sem conteúdo de fala detectado]"
+        estimated_tokens = 0
+    else:
+        # Análise básica da qualidade
+        word_count = len(transcription_text.split())
+        chars_count = len(transcription_text)
+        
+        # Métricas de eficiência
+        words_per_second = word_count / final_duration if final_duration > 0 else 0
+        chars_per_token = chars_count / estimated_tokens if estimated_tokens > 0 else 0
+        
+        # Log de métricas de qualidade
+        logger.info(f"Qualidade da transcrição:")
+        logger.info(f"  - Palavras: {word_count}")
+        logger.info(f"  - Caracteres: {chars_count}")
+        logger.info(f"  - Palavras/segundo: {words_per_second:.1f}")
+        logger.info(f"  - Caracteres/token: {chars_per_token:.1f}")
+        
+        # Validação de qualidade básica
+        if words_per_second > 8:  # Muito rápido para fala humana normal
+            logger.warning("Taxa de palavras muito alta - possível erro na transcrição")
+        elif words_per_second < 0.5 and final_duration > 10:  # Muito lento
+            logger.warning("Taxa de palavras muito baixa - áudio pode ter pouco conteúdo")
+    
+    # Cálculo de economia total
+    original_cost_minutes = duration_seconds / 60
+    optimized_cost_minutes = final_duration / 60
+    cost_savings = original_cost_minutes - optimized_cost_minutes
+    
+    logger.info(f"Transcrição OTIMIZADA concluída:")
+    logger.info(f"  - Tempo de processamento: {transcription_time:.2f}s")
+    logger.info(f"  - Duração original: {duration_seconds:.2f}s")
+    logger.info(f"  - Duração otimizada: {final_duration:.2f}s")
+    logger.info(f"  - Economia de custo: {cost_savings * 60:.1f}s ({cost_savings:.2f} minutos)")
+    logger.info(f"  - Tokens estimados: {estimated_tokens}")
+    
+    return TranscriptionResult(
+        text=transcription_text,
+        tokens_used=estimated_tokens,
+        model_used=MODEL,
+        duration_seconds=final_duration  # Usar duração otimizada
+    )
+
+def _transcription_error(e: Exception) -> RuntimeError:
+    """Converte falhas do ffmpeg ou da API em RuntimeError com mensagem padronizada"""
+    if isinstance(e, subprocess.CalledProcessError):
+        error_msg = f"Erro no FFmpeg: {_stderr_text(e) or str(e)}"
+    else:
+        error_msg = f"Erro inesperado na transcrição: {str(e)}"
+    logger.error(error_msg)
+    return RuntimeError(error_msg)
+
+def transcribe_mp4_to_text(video_path: str) -> TranscriptionResult:
+    """
+    Extrai o áudio de um MP4 e transcreve com OpenAI, retornando objeto com detalhes.
+    Requer: OPENAI_API_KEY no ambiente e ffmpeg instalado no PATH.
+    
+    Args:
+        video_path: Caminho para o arquivo MP4
+        
+    Returns:
+        TranscriptionResult: Objeto com texto, tokens utilizados, modelo e duração
+    """
+    video_path = Path(video_path)
+    if not video_path.exists():
+        raise FileNotFoundError(f"Arquivo não encontrado: {video_path}")
+
+    client = get_openai_client()
 
     try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            audio_wav = Path(tmpdir) / "audio.wav"
+        audio_data, upload_name, duration_seconds, final_duration = _prepare_audio(video_path)
 
-            logger.info(f"Iniciando processamento otimizado de: {video_path}")
-            
-            # Primeiro, obtém duração do arquivo original
-            duration_cmd = [
-                "ffprobe",
-                "-v", "quiet",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                str(video_path)
-            ]
-            
-            try:
-                duration_result = subprocess.run(duration_cmd, capture_output=True, text=True, check=True)
-                duration_seconds = float(duration_result.stdout.strip()) if duration_result.stdout.strip() else 0.0
-                logger.info(f"Duração do arquivo: {duration_seconds:.2f} segundos")
-            except (subprocess.CalledProcessError, ValueError) as e:
-                logger.warning(f"Não foi possível obter duração do arquivo: {e}")
-                duration_seconds = 0.0
-
-            # Extração de áudio SIMPLIFICADA e COMPATÍVEL
-            # Primeiro tentativa: versão básica e compatível
-            ffmpeg_cmd_basic = [
-                "ffmpeg",
-                "-y",  # sobrescreve arquivo existente
-                "-i", str(video_path),
-                "-vn",  # remove streams de vídeo
-                "-ac", "1",  # mono (reduz tamanho em ~50%)
-                "-ar", "16000",  # 16kHz (otimizado para fala humana)
-                "-acodec", "pcm_s16le",  # codec WAV sem perda
-                str(audio_wav),
-            ]
-            
-            # Segunda tentativa: com filtros básicos se a primeira falhar
-            ffmpeg_cmd_filtered = [
-                "ffmpeg",
-                "-y",
-                "-i", str(video_path),
-                "-vn",
-                "-ac", "1",
-                "-ar", "16000",
-                "-acodec", "pcm_s16le",
-                # Filtros básicos e universalmente compatíveis
-                "-af", "silenceremove=start_periods=1:start_threshold=-50dB",
-                str(audio_wav),
-            ]
-            
-            logger.info("Extraindo áudio do MP4...")
-            extraction_start = time.time()
-            
-            # Tentativa 1: Comando básico (mais compatível)
-            try:
-                logger.info("Tentando extração básica...")
-                result = subprocess.run(
-                    ffmpeg_cmd_basic, 
-                    capture_output=True, 
-                    text=True, 
-                    check=True
-                )
-                logger.info("✅ Extração básica bem-sucedida")
-                
-            except subprocess.CalledProcessError as e:
-                logger.warning(f"❌ Extração básica falhou: {e.stderr}")
-                
-                # Tentativa 2: Com filtro simples
-                try:
-                    logger.info("Tentando extração com filtro simples...")
-                    result = subprocess.run(
-                        ffmpeg_cmd_filtered,
-                        capture_output=True,
-                        text=True,
-                        check=True
-                    )
-                    logger.info("✅ Extração com filtro bem-sucedida")
-                    
-                except subprocess.CalledProcessError as e2:
-                    logger.error(f"❌ Todas as tentativas falharam")
-                    logger.error(f"Erro básico: {e.stderr}")
-                    logger.error(f"Erro com filtro: {e2.stderr}")
-                    
-                    # Tentativa 3: Comando minimalista (último recurso)
-                    logger.info("Tentando comando minimalista...")
-                    ffmpeg_cmd_minimal = [
-                        "ffmpeg", "-y", "-i", str(video_path), 
-                        "-vn", "-acodec", "pcm_s16le", str(audio_wav)
-                    ]
-                    
-                    result = subprocess.run(
-                        ffmpeg_cmd_minimal,
-                        capture_output=True,
-                        text=True,
-                        check=True
-                    )
-                    logger.info("✅ Extração minimalista bem-sucedida")
-            
-            extraction_time = time.time() - extraction_start
-            logger.info(f"Extração concluída em {extraction_time:.2f}s")
-            
-            # Verifica se o arquivo WAV foi criado
-            if not audio_wav.exists() or audio_wav.stat().st_size == 0:
-                raise RuntimeError("Falha na extração de áudio - arquivo WAV vazio ou não criado")
-
-            # Calcula duração FINAL do áudio processado
-            try:
-                final_duration_cmd = [
-                    "ffprobe",
-                    "-v", "quiet",
-                    "-show_entries", "format=duration",
-                    "-of", "default=noprint_wrappers=1:nokey=1",
-                    str(audio_wav)
-                ]
-                
-                final_duration_result = subprocess.run(final_duration_cmd, capture_output=True, text=True, check=True)
-                final_duration = float(final_duration_result.stdout.strip()) if final_duration_result.stdout.strip() else duration_seconds
-                
-                if final_duration != duration_seconds and duration_seconds > 0:
-                    economy_percent = ((duration_seconds - final_duration) / duration_seconds) * 100
-                    logger.info(f"Duração após processamento: {final_duration:.2f}s (original: {duration_seconds:.2f}s)")
-                    logger.info(f"Economia: {economy_percent:.1f}%")
-                else:
-                    logger.info(f"Duração do áudio: {final_duration:.2f}s")
-                    
-            except Exception as e:
-                logger.warning(f"Não foi possível calcular duração final: {e}")
-                final_duration = duration_seconds
-
-            # Transcrição OTIMIZADA com OpenAI Whisper
-            logger.info("Iniciando transcrição otimizada com OpenAI Whisper...")
-            transcription_start = time.time()
-            
-            with open(audio_wav, "rb") as f:
-                result = client.audio.transcriptions.create(
-                    model=MODEL,
-                    file=f,
-                    language=LANGUAGE,  # Especificar idioma melhora precisão
-                    response_format="verbose_json",  # Para obter detalhes e segmentos
-                    
-                    # PARÂMETROS OTIMIZADOS para maior precisão:
-                    temperature=0.0,  # Determinístico (mais assertivo, menos criativo)
-                    
-                    # Prompt inicial para melhorar contexto (português brasileiro)
-                    prompt="Este é um áudio em português brasileiro. Transcreva com pontuação adequada e formatação correta."
-                )
-            
-            transcription_time = time.time() - transcription_start
-            
-            # Extrai o texto e informações detalhadas da resposta
-            transcription_text = result.text if hasattr(result, 'text') else str(result)
-            
-            # Calcula tokens baseado na duração OTIMIZADA (pós-processamento)
-            # Usar a duração final (após remoção de silêncios) para cálculo mais preciso
-            estimated_tokens = int((final_duration / 60) * 175)  # 175 tokens por minuto
-            
-            # Análise de qualidade da transcrição
-            if not transcription_text.strip():
-                logger.warning("Transcrição retornou texto vazio")
-                transcription_text = "[Áudio sem conteúdo de fala detectado]"
-                estimated_tokens = 0
-            else:
-                # Análise básica da qualidade
-                word_count = len(transcription_text.split())
-                chars_count = len(transcription_text)
-                
-                # Métricas de eficiência
-                words_per_second = word_count / final_duration if final_duration > 0 else 0
-                chars_per_token = chars_count / estimated_tokens if estimated_tokens > 0 else 0
-                
-                # Log de métricas de qualidade
-                logger.info(f"Qualidade da transcrição:")
-                logger.info(f"  - Palavras: {word_count}")
-                logger.info(f"  - Caracteres: {chars_count}")
-                logger.info(f"  - Palavras/segundo: {words_per_second:.1f}")
-                logger.info(f"  - Caracteres/token: {chars_per_token:.1f}")
-                
-                # Validação de qualidade básica
-                if words_per_second > 8:  # Muito rápido para fala humana normal
-                    logger.warning("Taxa de palavras muito alta - possível erro na transcrição")
-                elif words_per_second < 0.5 and final_duration > 10:  # Muito lento
-                    logger.warning("Taxa de palavras muito baixa - áudio pode ter pouco conteúdo")
-            
-            # Cálculo de economia total
-            original_cost_minutes = duration_seconds / 60
-            optimized_cost_minutes = final_duration / 60
-            cost_savings = original_cost_minutes - optimized_cost_minutes
-            
-            logger.info(f"Transcrição OTIMIZADA concluída:")
-            logger.info(f"  - Tempo de processamento: {transcription_time:.2f}s")
-            logger.info(f"  - Duração original: {duration_seconds:.2f}s")
-            logger.info(f"  - Duração otimizada: {final_duration:.2f}s")
-            logger.info(f"  - Economia de custo: {cost_savings * 60:.1f}s ({cost_savings:.2f} minutos)")
-            logger.info(f"  - Tokens estimados: {estimated_tokens}")
-            
-            return TranscriptionResult(
-                text=transcription_text,
-                tokens_used=estimated_tokens,
-                model_used=MODEL,
-                duration_seconds=final_duration  # Usar duração otimizada
-            )
-            
-    except subprocess.CalledProcessError as e:
-        error_msg = f"Erro no FFmpeg: {e.stderr if e.stderr else str(e)}"
-        logger.error(error_msg)
-        raise RuntimeError(error_msg)
+        # Transcrição OTIMIZADA com OpenAI Whisper
+        logger.info("Iniciando transcrição otimizada com OpenAI Whisper...")
+        transcription_start = time.time()
+        result = client.audio.transcriptions.create(**_transcription_params(audio_data, upload_name))
+        transcription_time = time.time() - transcription_start
+        
+        return _build_result(result, duration_seconds, final_duration, transcription_time)
+        
     except Exception as e:
-        error_msg = f"Erro inesperado na transcrição: {str(e)}"
-        logger.error(error_msg)
-        raise RuntimeError(error_msg)
+        raise _transcription_error(e)
+
+async def transcribe_many_async(video_paths: List[Path]) -> List[TranscriptionResult]:
+    """
+    Transcreve vários arquivos em paralelo pela OpenAI.
+    
+    As extrações com ffmpeg rodam em threads enquanto os uploads de outros
+    arquivos estão em andamento; as chamadas ao Whisper são limitadas a
+    TRANSCRIPTION_MAX_CONCURRENCY simultâneas.
+    
+    Args:
+        video_paths: Caminhos dos arquivos de áudio/vídeo
+        
+    Returns:
+        List[TranscriptionResult]: Resultados na mesma ordem dos arquivos
+    """
+    client = get_async_openai_client()
+    semaphore = asyncio.Semaphore(TRANSCRIPTION_MAX_CONCURRENCY)
+
+    async def _transcribe_one(video_path) -> TranscriptionResult:
+        video_path = Path(video_path)
+        if not video_path.exists():
+            raise FileNotFoundError(f"Arquivo não encontrado: {video_path}")
+
+        try:
+            audio_data, upload_name, duration_seconds, final_duration = await asyncio.to_thread(
+                _prepare_audio, video_path
+            )
+
+            async with semaphore:
+                transcription_start = time.time()
+                result = await client.audio.transcriptions.create(**_transcription_params(audio_data, upload_name))
+                transcription_time = time.time() - transcription_start
+
+            return _build_result(result, duration_seconds, final_duration, transcription_time)
+
+        except Exception as e:
+            raise _transcription_error(e)
+
+    return await asyncio.gather(*(_transcribe_one(path) for path in video_paths))
 
 def test_ffmpeg_installation():
     """
@@ -1,32 +1,48 @@
-import base64
+import asyncio
 import logging
-import os
+from typing import Optional
 
-from decouple import config
-from openai import OpenAI
+import pybase64
 
-OPENAI_API_KEY = config("OPENAI_API_KEY")
+from api.utils.ia.openai_client import get_openai_client
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def process_image_with_vision(image_path: str, caption: str = "") -> str:
+# Máximo de chamadas simultâneas ao OpenAI Vision por processo
+VISION_MAX_CONCURRENCY = 8
+_vision_semaphore = asyncio.Semaphore(VISION_MAX_CONCURRENCY)
+
+async def process_image_with_vision(
+    image_bytes: Optional[bytes],
+    caption: str = "",
+    image_b64: Optional[str] = None,
+    image_url: Optional[str] = None
+) -> str:
     """
     Processa imagem usando OpenAI Vision para extrair texto.
     
     Args:
-        image_path: Caminho para o arquivo da imagem
+        image_bytes: Conteúdo binário da imagem (usado se image_b64 não for informado)
         caption: Caption/legenda da imagem se existir
+        image_b64: Imagem já em base64, sem prefixo data: (evita codificar de novo)
+        image_url: URL HTTPS da imagem já publicada (ex: blob do Azure); quando
+            informada, a OpenAI baixa a imagem e nada é enviado em base64
         
     Returns:
         str: Texto extraído da imagem
     """
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    client = get_openai_client()
     
     try:
-        # Lê a imagem e converte para base64
-        with open(image_path, "rb") as image_file:
-            image_data = base64.b64encode(image_file.read()).decode('utf-8')
+        if image_url is not None:
+            # Imagem já hospedada: envia só a URL (payload ~33% menor que o base64)
+            image_data = None
+            vision_url = image_url
+        else:
+            # Usa o base64 recebido como está; só codifica se vierem os bytes
+            # (pybase64 usa SIMD e o resultado é ASCII, sem custo de decodificar UTF-8)
+            image_data = image_b64 if image_b64 is not None else pybase64.b64encode(image_bytes).decode('ascii')
+            vision_url = f"data:image/jpeg;base64,{image_data}"
         
         # Constrói o prompt otimizado para extração de texto
         system_prompt = """#Instruções 
@@ -67,7 +83,7 @@ Analise a imagem e extraia TODO o texto visível seguindo as instruções."""
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:image/jpeg;base64,{image_data}",
+                            "url": vision_url,
                             "detail": "high"  # Usar alta resolução para melhor extração de texto
                         }
                     }
@@ -77,18 +93,26 @@ Analise a imagem e extraia TODO o texto visível seguindo as instruções."""
         
         logger.info("Iniciando extração de texto com OpenAI Vision...")
         
-        # Faz a chamada para a API
-        response = client.chat.completions.create(
-            model="gpt-4o",  # Modelo otimizado para visão e texto
-            messages=messages,
-            max_tokens=4000,  # Permite respostas longas para textos extensos
-            temperature=0.0   # Determinístico para maior precisão
-        )
+        # Faz a chamada para a API em uma thread (o cliente é síncrono), para que
+        # várias imagens sejam processadas ao mesmo tempo sem travar o event loop
+        async with _vision_semaphore:
+            response = await asyncio.to_thread(
+                client.chat.completions.create,
+                model="gpt-4o",  # Modelo otimizado para visão e texto
+                messages=messages,
+                max_tokens=4000,  # Permite respostas longas para textos extensos
+                temperature=0.0   # Determinístico para maior precisão
+            )
         
         extracted_text = response.choices[0].message.content.strip()
         
         # Estima tokens utilizados (aproximação baseada no tamanho da imagem e resposta)
-        image_size = os.path.getsize(image_path)
+        if image_bytes is not None:
+            image_size = len(image_bytes)
+        elif image_data is not None:
+            image_size = len(image_data) * 3 // 4
+        else:
+            image_size = 0  # Imagem por URL: tamanho desconhecido
         estimated_tokens = int((image_size / 1024) * 0.75) + len(extracted_text.split()) * 1.3
         
         logger.info(f"Extração concluída:")
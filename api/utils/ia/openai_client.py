@@ -0,0 +1,56 @@
+"""
+Clientes OpenAI compartilhados pelo processo.
+
+Criar um OpenAI() por chamada abre um novo pool de conexões (TCP + TLS) a
+cada requisição; aqui o cliente é criado uma única vez e reaproveitado, com
+HTTP/2 para multiplexar chamadas concorrentes na mesma conexão.
+"""
+
+import asyncio
+import threading
+from typing import Optional
+
+from decouple import config
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+OPENAI_API_KEY = config("OPENAI_API_KEY")
+
+OPENAI_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+
+_async_client: Optional[AsyncOpenAI] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_openai_client() -> OpenAI:
+    """Retorna o cliente OpenAI síncrono compartilhado (seguro entre threads)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(
+                    api_key=OPENAI_API_KEY,
+                    http_client=httpx.Client(http2=True, limits=OPENAI_LIMITS)
+                )
+    return _client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Retorna o cliente OpenAI assíncrono compartilhado.
+    As conexões de um cliente assíncrono pertencem ao event loop em que foram
+    abertas, então um novo cliente é criado se o loop em execução mudar
+    (ex: asyncio.run chamado mais de uma vez em um worker).
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            http_client=httpx.AsyncClient(http2=True, limits=OPENAI_LIMITS)
+        )
+        _async_client_loop = loop
+    return _async_client
@@ -1,5 +1,10 @@
+import base64
+from functools import lru_cache
+import json
+import time
+from typing import Optional
+
 import jwt
-from datetime import datetime, timedelta, timezone
 from jwt import decode, ExpiredSignatureError, InvalidTokenError
 from fastapi import Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -11,13 +16,63 @@ from api.utils.db_services import get_db
 
 security = HTTPBearer()
 
+# Quantidade de tokens distintos mantidos em cache de decodificação
+TOKEN_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _decode_verified(token: str, secret_key: str, algorithm: str) -> dict:
+    """
+    Valida a assinatura do token e retorna os claims, com cache por token.
+    A expiração não é verificada aqui, pois o resultado fica em cache: quem
+    chama deve conferir "exp" a cada uso. Falhas não são guardadas em cache.
+
+    O dict retornado é compartilhado entre chamadas e não deve ser modificado.
+    """
+    return decode(token, secret_key, algorithms=[algorithm], options={"verify_exp": False})
+
+
+def _peek_claims(token: str) -> dict:
+    """
+    Lê os claims do token sem validar a assinatura nem a estrutura completa.
+    Basta decodificar o payload (segunda parte do token) de base64url para JSON.
+
+    Raises:
+        jwt.DecodeError: Se o payload não puder ser decodificado
+    """
+    try:
+        payload_b64 = token.split(".", 2)[1]
+        payload_b64 += "=" * (-len(payload_b64) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload_b64))
+    except (IndexError, ValueError) as e:
+        raise jwt.DecodeError(f"Token malformado: {e}") from e
+
+    if not isinstance(claims, dict):
+        raise jwt.DecodeError("Payload do token não é um objeto JSON")
+    return claims
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _token_exp(token: str) -> Optional[float]:
+    """Retorna o claim "exp" do token sem validar a assinatura, com cache por token."""
+    return _peek_claims(token).get("exp")
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
     token = credentials.credentials
     try:
-        payload = decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        # A chave e o algoritmo fazem parte da chave do cache, então trocar o
+        # segredo invalida os resultados anteriores
+        payload = _decode_verified(token, settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM)
+
+        # Mesma regra do PyJWT: expirado quando exp <= agora
+        exp = payload.get("exp")
+        if exp is not None and exp <= time.time():
+            raise ExpiredSignatureError("Signature has expired")
+
         # A claim "sub" representa o identificador do usuário
         user_id = payload.get("user_id") or payload.get("sub")
 
@@ -49,8 +104,7 @@ def decode_refresh_token_unsafe(token: str) -> dict:
     """
     try:
         # Decodifica sem verificar assinatura
-        decoded_token = jwt.decode(token, options={"verify_signature": False})
-        return decoded_token
+        return _peek_claims(token)
     except jwt.PyJWTError:
         raise ExceptionUnauthorized(detail="Token malformado")
 
@@ -66,25 +120,17 @@ def is_token_nearing_expiration(token: str, margin_seconds: int = 30) -> bool:
         True se o token está dentro da margem de expiração, False caso contrário.
     """
     try:
-        # Decodifica o token apenas para ler os claims, sem verificar a assinatura
-        decoded_token = jwt.decode(token, options={"verify_signature": False})
-        
-        exp_timestamp = decoded_token.get("exp")
+        # Lê apenas o claim de expiração, sem verificar a assinatura (em cache por token)
+        exp_timestamp = _token_exp(token)
         if not exp_timestamp:
             # Se não houver claim de expiração, não podemos verificar
             return False
 
-        # Converte o timestamp de expiração para um objeto datetime
-        exp_time = datetime.fromtimestamp(exp_timestamp, tz=timezone.utc)
-        
-        # Pega o tempo atual em UTC
-        now_time = datetime.now(timezone.utc)
-        
-        # Calcula o tempo restante
-        time_remaining = exp_time - now_time
+        # Calcula o tempo restante em segundos, comparando timestamps UTC
+        time_remaining = exp_timestamp - time.time()
         
         # Verifica se o tempo restante é menor que a margem de segurança
-        return time_remaining < timedelta(seconds=margin_seconds)
+        return time_remaining < margin_seconds
 
     except jwt.PyJWTError:
         # Se o token for inválido e não puder ser decodificado, trata como expirado
@@ -1,17 +1,156 @@
 import io
 import os
+import re
 import logging
 import asyncio
+import tempfile
+from typing import Optional
 from urllib.parse import unquote, urlparse
 
-import requests
-from pdf2image import convert_from_bytes
+import httpx
+from pdf2image import convert_from_path
+from pdf2image.exceptions import PDFPageCountError, PDFSyntaxError
+from PIL import Image
 
 from api.utils.modules.upload.upload_utils import azure_upload_buffer
 
+# Tamanho dos blocos lidos da resposta HTTP ao baixar o PDF
+PDF_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Bytes iniciais pedidos via Range: em PDFs linearizados ("fast web view")
+# a primeira página inteira fica no começo do arquivo
+PDF_FIRST_PAGE_RANGE = 512 * 1024
+
+# O dicionário de linearização fica nos primeiros 1024 bytes do arquivo (PDF 1.7, anexo F);
+# /E é o offset do fim da primeira página
+_LINEARIZED_RE = re.compile(rb"/Linearized\b.*?/E\s+(\d+)", re.DOTALL)
+
+# Cliente HTTP compartilhado, criado sob demanda (reaproveita conexões entre downloads).
+# As conexões pertencem ao event loop em que foram abertas, então o cliente é
+# recriado quando o loop em execução muda (ex: asyncio.run por task do Celery)
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Retorna o cliente HTTP do event loop atual, criando-o se necessário"""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        if _client is not None and not _client.is_closed:
+            _fechar_cliente_antigo(_client, _client_loop)
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            follow_redirects=True,
+        )
+        _client_loop = loop
+    return _client
+
+
+def _fechar_cliente_antigo(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]):
+    """
+    Fecha o cliente de outro event loop. O aclose precisa rodar no loop dono das
+    conexões; se ele já terminou, os sockets são liberados junto com o cliente.
+    """
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        logging.debug("Event loop do cliente HTTP anterior encerrado, descartando o cliente")
+
+
+async def close_client():
+    """Fecha o cliente HTTP compartilhado (chamar no shutdown da aplicação)"""
+    global _client, _client_loop
+    if _client is not None:
+        if _client_loop is asyncio.get_running_loop():
+            await _client.aclose()
+        else:
+            _fechar_cliente_antigo(_client, _client_loop)
+        _client = None
+        _client_loop = None
+
+
+async def _baixar_pdf(pdf_url: str, pdf_path: str, headers: Optional[dict] = None) -> Optional[int]:
+    """
+    Baixa o PDF (ou o trecho pedido em headers) gravando em disco à medida que chega.
+
+    Returns:
+        int: Status HTTP da resposta (200 ou 206), ou None se o download falhar
+    """
+    async with _get_client().stream("GET", pdf_url, headers=headers) as response:
+        if response.status_code not in (200, 206):
+            logging.error("Falha ao fazer download do PDF")
+            return None
+
+        with open(pdf_path, "wb") as pdf_file:
+            async for chunk in response.aiter_bytes(PDF_DOWNLOAD_CHUNK_SIZE):
+                pdf_file.write(chunk)
+        return response.status_code
+
+
+def _primeira_pagina_no_trecho(pdf_path: str) -> bool:
+    """
+    Indica se o trecho baixado contém a primeira página inteira: só vale para PDFs
+    linearizados cujo fim da primeira página (/E) está dentro do que foi recebido.
+    Em PDFs comuns o poppler reconstrói a xref de um arquivo truncado sem erro e
+    geraria um thumbnail em branco ou parcial.
+    """
+    with open(pdf_path, "rb") as pdf_file:
+        head = pdf_file.read(1024)
+        match = _LINEARIZED_RE.search(head)
+        if match is None:
+            return False
+        return int(match.group(1)) <= os.fstat(pdf_file.fileno()).st_size
+
+
+def _renderizar_primeira_pagina(pdf_path: str, width: int):
+    """Renderiza a primeira página do PDF já na largura do thumbnail"""
+    # O poppler já renderiza na largura do thumbnail, em vez de gerar a
+    # página inteira a 200 DPI e descartar quase todos os pixels depois
+    images = convert_from_path(
+        pdf_path,
+        first_page=1,
+        last_page=1,
+        size=(width, None),
+        single_file=True,
+        thread_count=1,
+    )
+    if not images:
+        # Acontece com PDFs truncados em que o poppler não encontra a página
+        raise PDFSyntaxError("Nenhuma página renderizada")
+    return images
+
 
 # Função de trabalho síncrona (não bloqueia o event loop pois será executada em thread)
-def _gerar_thumbnail_pdf_sync(pdf_url: str):
+def _enviar_thumbnail_sync(image, url_path: str, thumbnail_size: tuple) -> str:
+    # 3. Criação do thumbnail (ajusta a altura de páginas em retrato)
+    buffer = io.BytesIO()
+    # Bilinear é visualmente equivalente ao Lanczos em 256px e mais barato;
+    # optimize/progressive fariam passadas extras de codificação sem ganho aqui
+    image.thumbnail(thumbnail_size, Image.Resampling.BILINEAR)
+    image.save(buffer, format="JPEG", quality=85, optimize=False, progressive=False)
+    buffer.seek(0)
+
+    # 4. Nome do arquivo
+    original_filename = os.path.basename(url_path)
+    base_name = os.path.splitext(original_filename)[0]
+    thumbnail_filename = f"{unquote(base_name)}_thumbnail.jpg"
+
+    # 5. Upload
+    return azure_upload_buffer(
+        buffer=buffer.getvalue(),
+        file_name=thumbnail_filename,
+        local_path="thumbnails",
+    )
+
+
+async def gerar_thumbnail_pdf(pdf_url: str):
+    """
+    Gera thumbnail da primeira página de um PDF.
+    O download é assíncrono (sem ocupar thread); só a renderização com
+    poppler/Pillow e o upload, que são bloqueantes, rodam no thread pool.
+    """
     try:
         parsed_url = urlparse(pdf_url)
         file_extension = os.path.splitext(parsed_url.path)[1].lower()
@@ -20,44 +159,38 @@ def _gerar_thumbnail_pdf_sync(pdf_url: str):
             logging.error("A URL não aponta para um arquivo PDF válido")
             return None
 
-        # 1. Download do PDF
-        response = requests.get(pdf_url)
-        if response.status_code != 200:
-            logging.error("Falha ao fazer download do PDF")
-            return None
+        thumbnail_size = (256, 256)
 
-        pdf_bytes = response.content
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf_path = os.path.join(tmpdir, "documento.pdf")
 
-        # 2. Conversão para imagem (primeira página)
-        images = convert_from_bytes(pdf_bytes, first_page=1, last_page=1)
+            # 1. Download só do início do PDF, suficiente para a primeira página
+            #    na maioria dos PDFs linearizados
+            status = await _baixar_pdf(pdf_url, pdf_path, headers={"Range": f"bytes=0-{PDF_FIRST_PAGE_RANGE - 1}"})
+            if status is None:
+                return None
 
-        # 3. Criação do thumbnail
-        thumbnail_size = (256, 256)
-        buffer = io.BytesIO()
-        images[0].thumbnail(thumbnail_size)
-        images[0].save(buffer, format="JPEG", quality=85)
-        buffer.seek(0)
-
-        # 4. Nome do arquivo
-        original_filename = os.path.basename(parsed_url.path)
-        base_name = os.path.splitext(original_filename)[0]
-        thumbnail_filename = f"{unquote(base_name)}_thumbnail.jpg"
-
-        # 5. Upload
-        url_thumbnail = azure_upload_buffer(
-            buffer=buffer.getvalue(),
-            file_name=thumbnail_filename,
-            local_path="thumbnails",
-        )
+            # 206 = recebemos só um trecho: usa-o apenas se contiver a primeira página
+            if status == 206 and not await asyncio.to_thread(_primeira_pagina_no_trecho, pdf_path):
+                logging.info("PDF não linearizado ou primeira página fora do trecho inicial, baixando PDF completo")
+                status = await _baixar_pdf(pdf_url, pdf_path)
+                if status is None:
+                    return None
 
-        return url_thumbnail
+            # 2. Conversão para imagem (primeira página)
+            try:
+                images = await asyncio.to_thread(_renderizar_primeira_pagina, pdf_path, thumbnail_size[0])
+            except (PDFPageCountError, PDFSyntaxError):
+                # Trecho linearizado que ainda assim não renderizou: baixa o arquivo inteiro
+                if status != 206:
+                    raise
+                logging.info("Falha ao renderizar o trecho inicial, baixando PDF completo")
+                if await _baixar_pdf(pdf_url, pdf_path) is None:
+                    return None
+                images = await asyncio.to_thread(_renderizar_primeira_pagina, pdf_path, thumbnail_size[0])
+
+        return await asyncio.to_thread(_enviar_thumbnail_sync, images[0], parsed_url.path, thumbnail_size)
 
     except Exception as e:
         logging.error(f"Erro no processamento: {str(e)}")
         return None
-
-
-# Wrapper assíncrono para ser usado no restante do código
-async def gerar_thumbnail_pdf(pdf_url: str):
-    """Gera thumbnail de forma assíncrona utilizando thread pool."""
-    return await asyncio.to_thread(_gerar_thumbnail_pdf_sync, pdf_url)
\ No newline at end of file
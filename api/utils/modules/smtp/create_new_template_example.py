@@ -71,12 +71,12 @@ def step_3_add_enum():
     
     enum_code = '''
 class EmailTemplateType(Enum):
-    PASSWORD_RESET = "password_reset"
-    WELCOME = "welcome"
-    VERIFICATION = "verification"
-    NOTIFICATION = "notification"
-    REMINDER = "reminder"
-    ORDER_CONFIRMATION = "order_confirmation"  # NOVA LINHA
+    PASSWORD_RESET = ("password_reset", "Redefinição de Senha")
+    WELCOME = ("welcome", "Boas-vindas")
+    VERIFICATION = ("verification", "Verificação de E-mail")
+    NOTIFICATION = ("notification", "Notificação")
+    REMINDER = ("reminder", "Lembrete")
+    ORDER_CONFIRMATION = ("order_confirmation", "Confirmação de Pedido")  # NOVA LINHA
 '''
     
     print("📝 Adicionar ao enum em email_service.py:")
@@ -2,12 +2,13 @@
 Script de debug para identificar problemas nos templates
 """
 
+import os
 import sys
-from pathlib import Path
 
 # Adicionar o caminho do projeto para permitir imports
-project_root = Path(__file__).parent.parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 def debug_template():
     """Debug do template para identificar problemas"""
@@ -15,10 +16,10 @@ def debug_template():
     print("="*50)
     
     try:
-        from api.utils.modules.smtp.email_service import EmailService, EmailTemplateType
+        from api.utils.modules.smtp.email_service import get_email_service, EmailTemplateType
         
         # Inicializar o serviço de email
-        email_service = EmailService()
+        email_service = get_email_service()
         print("✅ EmailService inicializado")
         
         # Tentar gerar apenas uma prévia
@@ -17,7 +17,7 @@ def example_conceptual_usage():
     # Exemplo 1: Email de redefinição de senha
     print("1. Email de redefinição de senha:")
     print("""
-    email_service = EmailService()
+    email_service = get_email_service()
     success = email_service.send_password_reset_email(
         email="usuario@exemplo.com",
         token="abc123def456",
@@ -200,12 +200,12 @@ def show_extension_guide():
     print("1. Adicione o novo tipo no enum EmailTemplateType:")
     print("""
     class EmailTemplateType(Enum):
-        PASSWORD_RESET = "password_reset"
-        WELCOME = "welcome"
-        VERIFICATION = "verification"
-        NOTIFICATION = "notification"
-        REMINDER = "reminder"
-        INVOICE = "invoice"  # Novo template
+        PASSWORD_RESET = ("password_reset", "Redefinição de Senha")
+        WELCOME = ("welcome", "Boas-vindas")
+        VERIFICATION = ("verification", "Verificação de E-mail")
+        NOTIFICATION = ("notification", "Notificação")
+        REMINDER = ("reminder", "Lembrete")
+        INVOICE = ("invoice", "Fatura")  # Novo template (valor, título do cabeçalho)
     """)
     
     print("2. Implemente o template no método _initialize_templates():")
@@ -1,42 +1,225 @@
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 import smtplib
+import string
+import threading
+import time
 from pathlib import Path
+from email import encoders
+from email.charset import Charset
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from enum import Enum
-from api.utils.settings import Settings
+from api.utils.settings import settings
 from .templates.template_config import get_template_config
 
 class EmailTemplateType(Enum):
-    PASSWORD_RESET = "password_reset"
-    WELCOME = "welcome"
-    VERIFICATION = "verification"
-    NOTIFICATION = "notification"
-    REMINDER = "reminder"
+    PASSWORD_RESET = ("password_reset", "Redefinição de Senha")
+    WELCOME = ("welcome", "Boas-vindas")
+    VERIFICATION = ("verification", "Verificação de E-mail")
+    NOTIFICATION = ("notification", "Notificação")
+    REMINDER = ("reminder", "Lembrete")
+    
+    def __new__(cls, value: str, header_title: str):
+        # O value continua sendo a string (EmailTemplateType("welcome") funciona);
+        # o título do cabeçalho fica como atributo do próprio membro
+        member = object.__new__(cls)
+        member._value_ = value
+        member.header_title = header_title
+        return member
+
+_formatter = string.Formatter()
+
+@lru_cache(maxsize=1)
+def _year_for_hour(hour: int) -> int:
+    return datetime.now().year
+
+def _current_year() -> int:
+    """Ano atual, recalculado no máximo uma vez por hora (evita criar um datetime por envio)"""
+    return _year_for_hour(int(time.time() // 3600))
+
+# UTF-8 sem codificação do corpo (Content-Transfer-Encoding: 8bit): o HTML vai como está,
+# sem base64 por envio, quando o servidor aceita 8BITMIME
+_UTF8_8BIT = Charset("utf-8")
+_UTF8_8BIT.body_encoding = None
+
+# Limite de linha do SMTP (RFC 5321), sem contar o CRLF
+_SMTP_MAX_LINE = 998
+
+# Timeout (s) das operações de socket da conexão SMTP mantida: um socket meio aberto
+# não pode travar o worker indefinidamente
+SMTP_TIMEOUT = 30
+
+# Conexão ociosa por mais que isso (s) é testada com NOOP antes do próximo envio
+SMTP_MAX_IDLE = 60
+
+# Marcador temporário do {content} ao dividir o base.html em prefixo/sufixo
+_CONTENT_MARKER = "\x00content\x00"
+
+class CompiledTemplate:
+    """
+    Format string analisado uma única vez no carregamento.
+    render() equivale a source.format_map(variables), mas sem reanalisar o
+    texto (HTML com CSS tem muitas chaves escapadas) a cada envio.
+    """
+    __slots__ = ("source", "_parts", "_simple", "fields", "is_static", "_static_text")
+    
+    def __init__(self, source: str):
+        self.source = source
+        self._parts = tuple(_formatter.parse(source))
+        # Nomes das variáveis usadas no template (sem atributo/índice: "user.name" -> "user")
+        self.fields = frozenset(
+            field.split(".", 1)[0].split("[", 1)[0]
+            for _, field, _, _ in self._parts if field is not None
+        )
+        # Campos com atributo/índice ou formato aninhado ficam com o format_map padrão
+        self._simple = all(
+            field is None or (
+                field.isidentifier() and "{" not in (spec or "")
+            )
+            for _, field, spec, _ in self._parts
+        )
+        # Sem nenhum campo o resultado é sempre o mesmo: só o texto com {{ }} já resolvidos
+        self.is_static = not self.fields
+        self._static_text = "".join(literal for literal, _, _, _ in self._parts) if self.is_static else None
+    
+    def render(self, variables: Mapping[str, Any]) -> str:
+        """Renderiza o template; variáveis ausentes geram KeyError, como no str.format"""
+        if self.is_static:
+            return self._static_text
+        if not self._simple:
+            return self.source.format_map(variables)
+        
+        chunks = []
+        for literal, field, spec, conversion in self._parts:
+            chunks.append(literal)
+            if field is not None:
+                value = variables[field]
+                if conversion:
+                    value = _formatter.convert_field(value, conversion)
+                chunks.append(format(value, spec))
+        return "".join(chunks)
+
+@lru_cache(maxsize=None)
+def get_compiled_template(source: str) -> CompiledTemplate:
+    """Template compilado compartilhado pelo processo (cada texto é analisado uma única vez)"""
+    return CompiledTemplate(source)
+
+@lru_cache(maxsize=None)
+def _read_template_file(template_path: Path) -> str:
+    """Conteúdo de um arquivo de template, lido do disco uma vez por processo"""
+    with open(template_path, 'r', encoding='utf-8') as file:
+        return file.read()
 
 class EmailTemplate:
+    # Sem __dict__ por instância: os atributos lidos a cada envio são acessos diretos
+    __slots__ = (
+        "subject", "html_content", "variables",
+        "_compiled_subject", "_compiled_html", "_required", "_required_with_subject", "subject_fields",
+    )
+    
     def __init__(self, subject: str, html_content: str, variables: list = None):
         self.subject = subject
         self.html_content = html_content
         self.variables = variables or []
+        self._compiled_subject = get_compiled_template(subject)
+        self.subject_fields = self._compiled_subject.fields
+        self._compiled_html = get_compiled_template(html_content)
+        # Variáveis exigidas pelo conteúdo e pelo assunto, calculadas no carregamento
+        self._required = self._compiled_html.fields
+        self._required_with_subject = self._compiled_html.fields | self._compiled_subject.fields
+    
+    def missing_variables(self, variables: Mapping[str, Any], with_subject: bool = True) -> List[str]:
+        """Retorna as variáveis exigidas pelo template que não estão em variables"""
+        required = self._required_with_subject if with_subject else self._required
+        return sorted(field for field in required if field not in variables)
+    
+    def render_subject(self, variables: Mapping[str, Any]) -> str:
+        """Renderiza o assunto com as variáveis"""
+        return self._compiled_subject.render(variables)
+    
+    def render(self, variables: Mapping[str, Any]) -> str:
+        """Renderiza o conteúdo HTML com as variáveis"""
+        return self._compiled_html.render(variables)
 
 class EmailService:
     def __init__(self):
-        self.settings = Settings()
+        # Instância única do módulo de configurações (não relê .env/ambiente a cada serviço)
+        self.settings = settings
         self.templates_dir = Path(__file__).parent / "templates"
         self._templates = self._load_templates()
+        self._variables_by_type = {t: template.variables for t, template in self._templates.items()}
+        # Variáveis padrão que não mudam entre envios, já resolvidas por tipo de template
+        self._defaults_by_type = {
+            t: {
+                "company_name": self.settings.SMTP_USER,
+                "header_title": t.header_title,
+                "footer": ""
+            }
+            for t in EmailTemplateType
+        }
+        # O base.html não muda em execução: lido e analisado uma vez para todos os envios
+        self._base_template = get_compiled_template(self._load_base_template())
+        self._split_base_template(_current_year())
+        self._static_subjects = self._prerender_subjects()
+        # Conexão SMTP reaproveitada entre envios (TLS + login só na primeira vez)
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_last_used = 0.0
+        self._smtp_lock = threading.Lock()
+        # Fila de envio em segundo plano (uma única thread, criada no primeiro uso)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    def _template_variables(self, template_type: EmailTemplateType, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Combina as variáveis do envio com as padrão do template, na ordem de prioridade.
+        Um dict plano (mesclado em C, poucas chaves) torna cada busca do render uma
+        única consulta de hash, em vez de percorrer as camadas de um ChainMap.
+        """
+        return {**self._defaults_by_type[template_type], "year": _current_year(), **variables}
     
-    def _get_header_title(self, template_type: EmailTemplateType) -> str:
-        """Retorna o título em português para o cabeçalho do email"""
-        header_titles = {
-            "password_reset": "Redefinição de Senha",
-            "welcome": "Boas-vindas",
-            "verification": "Verificação de E-mail",
-            "notification": "Notificação",
-            "reminder": "Lembrete"
+    def _prerender_subjects(self) -> Dict[EmailTemplateType, str]:
+        """Renderiza de antemão os assuntos que só usam variáveis padrão (ex: {company_name})"""
+        return {
+            t: template.render_subject(self._defaults_by_type[t])
+            for t, template in self._templates.items()
+            if template.subject_fields <= self._defaults_by_type[t].keys()
         }
-        return header_titles.get(template_type.value, template_type.value.replace("_", " ").title())
+    
+    def _split_base_template(self, year: int):
+        """
+        Pré-renderiza o base.html por tipo de template com as variáveis padrão,
+        dividindo-o em prefixo e sufixo ao redor de {content}. Assim, o envio
+        só concatena prefixo + conteúdo + sufixo.
+        """
+        self._base_fields = self._base_template.fields - {"content"}
+        self._base_halves_year = year
+        self._base_halves = {}
+        for t in EmailTemplateType:
+            variables = {**self._defaults_by_type[t], "year": year, "content": _CONTENT_MARKER}
+            rendered = self._base_template.render(variables)
+            if rendered.count(_CONTENT_MARKER) == 1:
+                self._base_halves[t] = tuple(rendered.split(_CONTENT_MARKER))
+    
+    def _wrap_in_base(self,
+                      template_type: EmailTemplateType,
+                      content: str,
+                      variables: Dict[str, Any],
+                      all_variables: Dict[str, Any]) -> str:
+        """Insere o conteúdo renderizado no template base"""
+        year = all_variables["year"]
+        if year != self._base_halves_year:
+            # Virada de ano com o processo em execução
+            self._split_base_template(year)
+        
+        halves = self._base_halves.get(template_type)
+        # Se o chamador sobrescreve alguma variável do base.html, renderiza por completo
+        if halves is None or not self._base_fields.isdisjoint(variables):
+            return self._base_template.render({**all_variables, "content": content})
+        return halves[0] + content + halves[1]
     
     def _load_template_file(self, filename: str) -> str:
         """Carrega um arquivo de template HTML"""
@@ -44,8 +227,7 @@ class EmailService:
         if not template_path.exists():
             raise FileNotFoundError(f"Template não encontrado: {filename}")
         
-        with open(template_path, 'r', encoding='utf-8') as file:
-            return file.read()
+        return _read_template_file(template_path)
     
     def _load_base_template(self) -> str:
         """Carrega o template base HTML"""
@@ -84,60 +266,223 @@ class EmailService:
             custom_subject: Assunto customizado (opcional)
         """
         
+        subject, html_content = self._render_email(template_type, variables, custom_subject)
+        
+        # Enviar email
+        return self._send_message(self._build_message(to_email, subject, html_content))
+    
+    def send_email_background(self,
+                              template_type: EmailTemplateType,
+                              to_email: str,
+                              variables: Dict[str, Any],
+                              from_name: Optional[str] = None,
+                              custom_subject: Optional[str] = None) -> "Future[bool]":
+        """
+        Renderiza o email e enfileira o envio SMTP, retornando sem esperar o servidor.
+        Erros de template são levantados imediatamente; o resultado do envio fica no Future.
+        
+        Args:
+            template_type: Tipo do template a ser usado
+            to_email: Email do destinatário
+            variables: Dicionário com as variáveis do template
+            from_name: Nome do remetente (opcional)
+            custom_subject: Assunto customizado (opcional)
+            
+        Returns:
+            Future[bool]: Resultado do envio, como em send_email
+        """
+        subject, html_content = self._render_email(template_type, variables, custom_subject)
+        msg = self._build_message(to_email, subject, html_content)
+        
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="email-sender")
+            return self._executor.submit(self._send_message, msg)
+    
+    def send_bulk(self,
+                  template_type: EmailTemplateType,
+                  jobs: List[Tuple[str, Dict[str, Any]]],
+                  from_name: Optional[str] = None,
+                  custom_subject: Optional[str] = None) -> List[bool]:
+        """
+        Envia o mesmo template para vários destinatários em uma única sessão SMTP.
+        Destinatários com as mesmas variáveis (ex: avisos gerais) reaproveitam o
+        HTML já renderizado.
+        
+        Args:
+            template_type: Tipo do template a ser usado
+            jobs: Lista de (email do destinatário, variáveis do template)
+            from_name: Nome do remetente (opcional)
+            custom_subject: Assunto customizado (opcional)
+            
+        Returns:
+            List[bool]: Resultado do envio de cada item, na mesma ordem de jobs
+        """
+        rendered_cache: Dict[tuple, Tuple[str, str]] = {}
+        messages = []
+        
+        for to_email, variables in jobs:
+            try:
+                cache_key = tuple(sorted(variables.items()))
+                hash(cache_key)
+            except TypeError:
+                # Variáveis com valores não hasheáveis: renderiza sem cache
+                cache_key = None
+            
+            rendered = rendered_cache.get(cache_key) if cache_key is not None else None
+            if rendered is None:
+                rendered = self._render_email(template_type, variables, custom_subject)
+                if cache_key is not None:
+                    rendered_cache[cache_key] = rendered
+            
+            messages.append(self._build_message(to_email, *rendered))
+        
+        # Uma única aquisição do lock para todo o lote
+        with self._smtp_lock:
+            return [self._deliver(msg) for msg in messages]
+    
+    def _render_email(self,
+                      template_type: EmailTemplateType,
+                      variables: Dict[str, Any],
+                      custom_subject: Optional[str] = None) -> Tuple[str, str]:
+        """Renderiza assunto e HTML final (conteúdo dentro do template base)"""
         if template_type not in self._templates:
             raise ValueError(f"Template {template_type} não encontrado")
         
         template = self._templates[template_type]
         
-        # Preparar variáveis padrão
-        default_variables = {
-            "company_name": self.settings.SMTP_USER,
-            "year": datetime.now().year,
-            "header_title": self._get_header_title(template_type),
-            "footer": ""
-        }
+        # Variáveis do chamador têm prioridade sobre as padrão
+        all_variables = self._template_variables(template_type, variables)
         
-        # Mesclar variáveis
-        all_variables = {**default_variables, **variables}
+        missing = template.missing_variables(all_variables, with_subject=not custom_subject)
+        if missing:
+            raise ValueError(f"Variáveis obrigatórias não fornecidas: {', '.join(missing)}")
         
         # Renderizar template
-        try:
-            subject = custom_subject or template.subject.format(**all_variables)
-            content = template.html_content.format(**all_variables)
-            
-            # Carregar template base e inserir conteúdo
-            base_template = self._load_base_template()
-            html_content = base_template.format(
-                content=content,
-                **all_variables
-            )
-            
-        except KeyError as e:
-            raise ValueError(f"Variável obrigatória não fornecida: {e}")
+        if custom_subject:
+            subject = custom_subject
+        elif template_type in self._static_subjects and template.subject_fields.isdisjoint(variables):
+            # Assunto já renderizado no carregamento (o chamador não sobrescreve suas variáveis)
+            subject = self._static_subjects[template_type]
+        else:
+            subject = template.render_subject(all_variables)
+        content = template.render(all_variables)
         
-        # Preparar mensagem
-        msg = MIMEMultipart()
+        # Inserir conteúdo no template base
+        html_content = self._wrap_in_base(template_type, content, variables, all_variables)
+        
+        return subject, html_content
+    
+    def _build_message(self, to_email: str, subject: str, html_content: str) -> MIMEText:
+        """Monta a mensagem MIME para um destinatário"""
+        # Uma única parte HTML: sem o invólucro multipart e seus delimitadores.
+        # Linhas acima do limite do SMTP só podem ir codificadas (base64)
+        if max(map(len, html_content.encode("utf-8").splitlines()), default=0) <= _SMTP_MAX_LINE:
+            msg = MIMEText(html_content, "html", _UTF8_8BIT)
+        else:
+            msg = MIMEText(html_content, "html", "utf-8")
         msg["From"] = self.settings.SMTP_USER
         msg["To"] = to_email
         msg["Subject"] = subject
+        return msg
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Abre uma conexão SMTP autenticada"""
+        server = smtplib.SMTP(self.settings.SMTP_HOST, self.settings.SMTP_PORT, timeout=SMTP_TIMEOUT)
+        try:
+            server.starttls()
+            server.login(self.settings.SMTP_USER, self.settings.SMTP_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _reset_connection(self):
+        """Descarta a conexão atual (deve ser chamado com o lock adquirido)"""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                self._smtp.close()
+            self._smtp = None
+    
+    def _ensure_connection(self):
+        """
+        Garante uma conexão utilizável (deve ser chamado com o lock adquirido).
+        Depois de um tempo ociosa, a conexão é testada com NOOP e descartada se o
+        servidor não responder.
+        """
+        if self._smtp is not None and time.monotonic() - self._smtp_last_used > SMTP_MAX_IDLE:
+            try:
+                alive = self._smtp.noop()[0] == 250
+            except (smtplib.SMTPException, OSError):
+                alive = False
+            if not alive:
+                # Sem QUIT: o socket já não responde
+                self._smtp.close()
+                self._smtp = None
         
-        msg.attach(MIMEText(html_content, "html"))
-        
-        # Enviar email
-        return self._send_message(msg)
+        if self._smtp is None:
+            self._smtp = self._connect()
     
-    def _send_message(self, msg: MIMEMultipart) -> bool:
-        """Método privado para envio da mensagem"""
+    def _transmit(self, msg: MIMEText):
+        """Envia pela conexão atual; corpo 8bit só vai direto se o servidor anunciar 8BITMIME"""
+        if msg["Content-Transfer-Encoding"] == "8bit":
+            if self._smtp.has_extn("8bitmime"):
+                self._smtp.send_message(msg, mail_options=("BODY=8BITMIME",))
+                return
+            del msg["Content-Transfer-Encoding"]
+            encoders.encode_base64(msg)
+        self._smtp.send_message(msg)
+    
+    def _deliver(self, msg: MIMEText) -> bool:
+        """Envia a mensagem pela conexão mantida (deve ser chamado com o lock adquirido)"""
         try:
-            with smtplib.SMTP(self.settings.SMTP_HOST, self.settings.SMTP_PORT) as server:
-                server.starttls()
-                server.login(self.settings.SMTP_USER, self.settings.SMTP_PASSWORD)
-                server.send_message(msg)
+            self._ensure_connection()
+            try:
+                self._transmit(msg)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                # O servidor encerra conexões ociosas: reconecta e tenta uma vez
+                self._reset_connection()
+                self._smtp = self._connect()
+                self._transmit(msg)
+            self._smtp_last_used = time.monotonic()
             return True
         except Exception as e:
             print(f"Erro ao enviar e-mail: {e}")
+            self._reset_connection()
             return False
     
+    def _send_message(self, msg: MIMEText) -> bool:
+        """Método privado para envio da mensagem"""
+        with self._smtp_lock:
+            return self._deliver(msg)
+    
+    @contextmanager
+    def smtp_session(self):
+        """
+        Agrupa vários envios na mesma sessão SMTP: a conexão (TLS + login) é aberta
+        no primeiro envio do bloco, reaproveitada pelos demais e encerrada ao sair.
+        
+        Exemplo:
+            with email_service.smtp_session():
+                email_service.send_welcome_email(...)
+                email_service.send_notification_email(...)
+        """
+        try:
+            yield self
+        finally:
+            self.close()
+    
+    def close(self):
+        """Aguarda os envios em segundo plano e encerra a conexão SMTP mantida pelo serviço"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._smtp_lock:
+            self._reset_connection()
+    
     def get_template_preview(self, template_type: EmailTemplateType, variables: Dict[str, Any]) -> str:
         """
         Gera uma prévia do template com as variáveis fornecidas
@@ -148,32 +493,28 @@ class EmailService:
         
         template = self._templates[template_type]
         
-        # Preparar variáveis padrão
-        default_variables = {
-            "company_name": self.settings.SMTP_USER,
-            "year": datetime.now().year,
-            "header_title": self._get_header_title(template_type),
-            "footer": ""
-        }
+        # Variáveis do chamador têm prioridade sobre as padrão
+        all_variables = self._template_variables(template_type, variables)
         
-        # Mesclar variáveis
-        all_variables = {**default_variables, **variables}
+        missing = template.missing_variables(all_variables, with_subject=False)
+        if missing:
+            raise ValueError(f"Variáveis obrigatórias não fornecidas: {', '.join(missing)}")
         
-        try:
-            content = template.html_content.format(**all_variables)
-            base_template = self._load_base_template()
-            return base_template.format(content=content, **all_variables)
-        except KeyError as e:
-            raise ValueError(f"Variável obrigatória não fornecida: {e}")
+        content = template.render(all_variables)
+        return self._wrap_in_base(template_type, content, variables, all_variables)
     
     def list_template_variables(self, template_type: EmailTemplateType) -> list:
         """Retorna as variáveis obrigatórias de um template"""
-        config = get_template_config(template_type.value)
-        return config.variables
+        return self._variables_by_type[template_type]
     
     def reload_templates(self):
         """Recarrega todos os templates (útil em desenvolvimento)"""
+        _read_template_file.cache_clear()
         self._templates = self._load_templates()
+        self._variables_by_type = {t: template.variables for t, template in self._templates.items()}
+        self._base_template = get_compiled_template(self._load_base_template())
+        self._split_base_template(_current_year())
+        self._static_subjects = self._prerender_subjects()
     
     # Métodos de conveniência para manter compatibilidade
     def send_password_reset_email(self, email: str, token: str, expiry_time: str = "1 hora") -> bool:
@@ -245,3 +586,16 @@ class EmailService:
                 "reminder_datetime": reminder_datetime
             }
         )
+
+
+@lru_cache(maxsize=1)
+def get_email_service() -> EmailService:
+    """
+    Retorna o EmailService compartilhado pelo processo.
+    Os templates são lidos e analisados uma única vez e a conexão SMTP é
+    reaproveitada entre chamadas; use EmailService() apenas quando precisar
+    de uma instância isolada.
+    """
+    service = EmailService()
+    atexit.register(service.close)
+    return service
@@ -2,11 +2,15 @@
 Configuração dos templates de email
 """
 
+from functools import lru_cache
+import re
 from typing import Dict, List
 
 class TemplateConfig:
     """Configuração de um template de email"""
     
+    __slots__ = ("subject", "template_file", "variables", "description", "_var_regex")
+    
     def __init__(self, 
                  subject: str, 
                  template_file: str, 
@@ -16,6 +20,17 @@ class TemplateConfig:
         self.template_file = template_file
         self.variables = variables or []
         self.description = description
+        # Uma única regex com todos os placeholders: uma passada pelo HTML em vez de uma busca por variável
+        self._var_regex = re.compile(
+            "|".join(re.escape("{" + var + "}") for var in self.variables)
+        ) if self.variables else None
+    
+    def missing_variables(self, content: str) -> List[str]:
+        """Retorna as variáveis configuradas que não aparecem como {variavel} no conteúdo"""
+        if self._var_regex is None:
+            return []
+        found = set(self._var_regex.findall(content))
+        return [var for var in self.variables if "{" + var + "}" not in found]
 
 # Configurações dos templates disponíveis
 TEMPLATE_CONFIGS = {
@@ -55,6 +70,7 @@ TEMPLATE_CONFIGS = {
     )
 }
 
+@lru_cache(maxsize=None)
 def get_template_config(template_type: str) -> TemplateConfig:
     """Retorna a configuração de um template"""
     if template_type not in TEMPLATE_CONFIGS:
@@ -2,12 +2,14 @@
 Script simples para testar o envio de email
 """
 
+import os
 import sys
 from pathlib import Path
 
 # Adicionar o caminho do projeto para permitir imports
-project_root = Path(__file__).parent.parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 def test_single_email():
     """Testa o envio de um único email de notificação"""
@@ -2,12 +2,14 @@
 Teste final de envio de emails - versão simplificada
 """
 
+import os
 import sys
 from pathlib import Path
 
 # Adicionar o caminho do projeto para permitir imports
-project_root = Path(__file__).parent.parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 def test_essential_emails():
     """Testa o envio dos emails essenciais do sistema"""
@@ -27,77 +29,79 @@ def test_essential_emails():
         emails_sent = 0
         total_emails = 4
         
-        # 1. Email de Notificação (mais genérico e útil)
-        print(f"\n📧 1/4 - Enviando email de notificação...")
-        try:
-            success = email_service.send_notification_email(
-                email=test_email,
-                user_name="Pedro",
-                message="Sistema de email do FGNIA API está funcionando perfeitamente! ✅",
-                notification_subject="Sistema Operacional",
-                action_button='<a href="https://github.com/pedroffda" style="background-color: #28a745; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; font-weight: bold;">Ver GitHub</a>',
-                additional_info="Teste executado com sucesso em " + str(Path().cwd())
-            )
+        # Os quatro envios compartilham uma única conexão SMTP (TLS + login uma vez)
+        with email_service.smtp_session():
+            # 1. Email de Notificação (mais genérico e útil)
+            print(f"\n📧 1/4 - Enviando email de notificação...")
+            try:
+                success = email_service.send_notification_email(
+                    email=test_email,
+                    user_name="Pedro",
+                    message="Sistema de email do FGNIA API está funcionando perfeitamente! ✅",
+                    notification_subject="Sistema Operacional",
+                    action_button='<a href="https://github.com/pedroffda" style="background-color: #28a745; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; font-weight: bold;">Ver GitHub</a>',
+                    additional_info="Teste executado com sucesso em " + str(Path().cwd())
+                )
+                
+                if success:
+                    print("   ✅ Notificação enviada!")
+                    emails_sent += 1
+                else:
+                    print("   ❌ Falha na notificação")
+            except Exception as e:
+                print(f"   ❌ Erro: {e}")
             
-            if success:
-                print("   ✅ Notificação enviada!")
-                emails_sent += 1
-            else:
-                print("   ❌ Falha na notificação")
-        except Exception as e:
-            print(f"   ❌ Erro: {e}")
-        
-        # 2. Email de Boas-vindas
-        print(f"\n🎉 2/4 - Enviando email de boas-vindas...")
-        try:
-            success = email_service.send_welcome_email(
-                email=test_email,
-                user_name="Pedro (Teste Final)",
-                dashboard_link="https://exemplo.com/dashboard"
-            )
-            
-            if success:
-                print("   ✅ Boas-vindas enviado!")
-                emails_sent += 1
-            else:
-                print("   ❌ Falha nas boas-vindas")
-        except Exception as e:
-            print(f"   ❌ Erro: {e}")
-        
-        # 3. Email de Verificação
-        print(f"\n📧 3/4 - Enviando email de verificação...")
-        try:
-            success = email_service.send_verification_email(
-                email=test_email,
-                verification_link="https://exemplo.com/verify?code=ABC123",
-                verification_code="ABC123",
-                expiry_time="2 horas"
-            )
+            # 2. Email de Boas-vindas
+            print(f"\n🎉 2/4 - Enviando email de boas-vindas...")
+            try:
+                success = email_service.send_welcome_email(
+                    email=test_email,
+                    user_name="Pedro (Teste Final)",
+                    dashboard_link="https://exemplo.com/dashboard"
+                )
+                
+                if success:
+                    print("   ✅ Boas-vindas enviado!")
+                    emails_sent += 1
+                else:
+                    print("   ❌ Falha nas boas-vindas")
+            except Exception as e:
+                print(f"   ❌ Erro: {e}")
             
-            if success:
-                print("   ✅ Verificação enviada!")
-                emails_sent += 1
-            else:
-                print("   ❌ Falha na verificação")
-        except Exception as e:
-            print(f"   ❌ Erro: {e}")
-        
-        # 4. Email de Reset de Senha
-        print(f"\n🔐 4/4 - Enviando email de reset de senha...")
-        try:
-            success = email_service.send_password_reset_email(
-                email=test_email,
-                token="token_de_teste_123",
-                expiry_time="30 minutos"
-            )
+            # 3. Email de Verificação
+            print(f"\n📧 3/4 - Enviando email de verificação...")
+            try:
+                success = email_service.send_verification_email(
+                    email=test_email,
+                    verification_link="https://exemplo.com/verify?code=ABC123",
+                    verification_code="ABC123",
+                    expiry_time="2 horas"
+                )
+                
+                if success:
+                    print("   ✅ Verificação enviada!")
+                    emails_sent += 1
+                else:
+                    print("   ❌ Falha na verificação")
+            except Exception as e:
+                print(f"   ❌ Erro: {e}")
             
-            if success:
-                print("   ✅ Reset de senha enviado!")
-                emails_sent += 1
-            else:
-                print("   ❌ Falha no reset de senha")
-        except Exception as e:
-            print(f"   ❌ Erro: {e}")
+            # 4. Email de Reset de Senha
+            print(f"\n🔐 4/4 - Enviando email de reset de senha...")
+            try:
+                success = email_service.send_password_reset_email(
+                    email=test_email,
+                    token="token_de_teste_123",
+                    expiry_time="30 minutos"
+                )
+                
+                if success:
+                    print("   ✅ Reset de senha enviado!")
+                    emails_sent += 1
+                else:
+                    print("   ❌ Falha no reset de senha")
+            except Exception as e:
+                print(f"   ❌ Erro: {e}")
         
         # Resumo final
         print("\n" + "="*55)
@@ -2,12 +2,14 @@
 Teste dos templates HTML externos
 """
 
+import os
 import sys
 from pathlib import Path
 
 # Adicionar o caminho do projeto para permitir imports
-project_root = Path(__file__).parent.parent.parent.parent.parent
-sys.path.insert(0, str(project_root))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 from api.utils.settings import Settings
 
@@ -51,10 +53,7 @@ def test_template_loading():
                     print(f"   🔧 Variáveis: {', '.join(config.variables)}")
                     
                     # Verificar se as variáveis estão no template
-                    missing_vars = []
-                    for var in config.variables:
-                        if f"{{{var}}}" not in content:
-                            missing_vars.append(var)
+                    missing_vars = config.missing_variables(content)
                     
                     if missing_vars:
                         print(f"   ⚠️  Variáveis ausentes no template: {', '.join(missing_vars)}")
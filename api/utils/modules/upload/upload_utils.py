@@ -1,24 +1,101 @@
+import asyncio
 import logging
-from typing import Optional
+import os
+import threading
+from typing import List, Optional, Tuple, Union
 
-from pydantic import BaseModel, FilePath
-from azure.storage.blob import BlobServiceClient, BlobClient
-from api.utils.exceptions import ExceptionInternalServerError
-from api.utils.settings import Settings
+from decouple import config
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
+from api.utils.exceptions import ExceptionBadRequest, ExceptionInternalServerError
+from api.utils.settings import settings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("UPLOAD_UTIL")
 
-# Para validação de parametros
-class AzureUploadFileParams(BaseModel):
-    output_file: FilePath
-    file_name: str
-    local_path: str
+# Blocos enviados em paralelo por upload (o SDK divide em blocos de 4 MiB)
+AZURE_UPLOAD_CONCURRENCY = config("AZURE_UPLOAD_CONCURRENCY", default=8, cast=int)
+# Faixas baixadas em paralelo por download (independente do upload)
+AZURE_DOWNLOAD_CONCURRENCY = config("AZURE_DOWNLOAD_CONCURRENCY", default=8, cast=int)
 
-class AzureUploadBuffer(BaseModel):
-    buffer: bytes
-    file_name: str
-    local_path: str
+# Até este tamanho o upload é um único PUT; acima, vai em blocos paralelos
+AZURE_MAX_SINGLE_PUT_SIZE = 16 * 1024 * 1024
+
+# Cliente do container criado uma única vez e reaproveitado entre uploads
+# (sem reprocessar a connection string nem abrir nova sessão HTTPS a cada chamada)
+_container_client: Optional[ContainerClient] = None
+_container_client_lock = threading.Lock()
+
+# Versão assíncrona (azure.storage.blob.aio): as conexões pertencem ao event loop
+# em que foram abertas, então o cliente é recriado se o loop mudar
+# (o BlobServiceClient é mantido porque é ele quem fecha a sessão aiohttp)
+_async_service_client = None
+_async_container_client = None
+_async_container_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_container() -> ContainerClient:
+    """Retorna o ContainerClient compartilhado, criando-o se necessário"""
+    global _container_client
+    if _container_client is None:
+        with _container_client_lock:
+            if _container_client is None:
+                blob_service_client = BlobServiceClient.from_connection_string(
+                    settings.AZURE_STORAGE_CONNECTION_STRING,
+                    max_single_put_size=AZURE_MAX_SINGLE_PUT_SIZE,
+                )
+                _container_client = blob_service_client.get_container_client(settings.AZURE_STORAGE_CONTAINER)
+    return _container_client
+
+
+def _get_async_container():
+    """
+    Retorna o ContainerClient assíncrono compartilhado pelo event loop atual.
+    Todos os uploads usam a mesma sessão aiohttp (conexões mantidas entre chamadas).
+    """
+    global _async_service_client, _async_container_client, _async_container_loop
+    loop = asyncio.get_running_loop()
+    if _async_container_client is None or _async_container_loop is not loop:
+        if _async_service_client is not None:
+            _fechar_cliente_antigo(_async_service_client, _async_container_loop)
+        # Import tardio: o cliente assíncrono depende do aiohttp
+        import aiohttp
+        from azure.core.pipeline.transport import AioHttpTransport
+        from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+        
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=64, keepalive_timeout=30))
+        _async_service_client = AsyncBlobServiceClient.from_connection_string(
+            settings.AZURE_STORAGE_CONNECTION_STRING,
+            max_single_put_size=AZURE_MAX_SINGLE_PUT_SIZE,
+            transport=AioHttpTransport(session=session, session_owner=True),
+        )
+        _async_container_client = _async_service_client.get_container_client(settings.AZURE_STORAGE_CONTAINER)
+        _async_container_loop = loop
+    return _async_container_client
+
+
+def _fechar_cliente_antigo(client, loop: Optional[asyncio.AbstractEventLoop]):
+    """
+    Fecha o cliente (e a sessão aiohttp) de outro event loop. O close precisa rodar
+    no loop dono das conexões; se ele já terminou, o cliente é apenas descartado.
+    """
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.close(), loop)
+    else:
+        logger.debug("Event loop do cliente assíncrono anterior encerrado, descartando o cliente")
+
+
+async def close_async_client():
+    """Fecha o cliente assíncrono compartilhado (chamar no shutdown da aplicação)"""
+    global _async_service_client, _async_container_client, _async_container_loop
+    if _async_service_client is not None:
+        if _async_container_loop is asyncio.get_running_loop():
+            await _async_service_client.close()
+        else:
+            _fechar_cliente_antigo(_async_service_client, _async_container_loop)
+        _async_service_client = None
+        _async_container_client = None
+        _async_container_loop = None
 
 def azure_upload_file(output_file: str, file_name: str, local_path: str) -> str:
     """
@@ -28,22 +105,22 @@ def azure_upload_file(output_file: str, file_name: str, local_path: str) -> str:
     :param local_path: Local onde o arquivo está armazenado.
     :return: Caminho do arquivo enviado.
     """
-    settings = Settings()
-    params = AzureUploadFileParams(
-        output_file=output_file,
-        file_name=file_name, 
-        local_path=local_path
-    )
+    # Uma única verificação direta, sem modelo Pydantic/pathlib por upload
+    if not os.path.isfile(output_file):
+        raise ExceptionBadRequest(detail=f"Arquivo não encontrado: {output_file}")
+    
     try:
-        blob_service_client = BlobServiceClient.from_connection_string(settings.AZURE_STORAGE_CONNECTION_STRING)
-        container_client = blob_service_client.get_container_client(settings.AZURE_STORAGE_CONTAINER)
-        
         with open(output_file, "rb") as data:
-            blob_client = container_client.get_blob_client(f"{params.local_path}/{params.file_name}")
-            blob_client.upload_blob(data, overwrite=True)
-            logger.info(f"Arquivo {params.file_name} enviado com sucesso para o Azure Blob Storage como {params.file_name}.")
+            blob_client = _get_container().get_blob_client(f"{local_path}/{file_name}")
+            blob_client.upload_blob(
+                data,
+                overwrite=True,
+                length=os.fstat(data.fileno()).st_size,
+                max_concurrency=AZURE_UPLOAD_CONCURRENCY,
+            )
+            logger.info(f"Arquivo {file_name} enviado com sucesso para o Azure Blob Storage como {file_name}.")
             
-        response = f"{settings.AZURE_STORAGE_LINK}/{settings.AZURE_STORAGE_CONTAINER}/{params.local_path}/{params.file_name}"
+        response = f"{settings.AZURE_STORAGE_LINK}/{settings.AZURE_STORAGE_CONTAINER}/{local_path}/{file_name}"
         
     except Exception as e:
         logger.error(f"Erro ao enviar o arquivo para o Azure: {e}")
@@ -52,7 +129,7 @@ def azure_upload_file(output_file: str, file_name: str, local_path: str) -> str:
     return response
 
 
-def azure_upload_buffer(buffer: bytes, file_name: str, local_path: str) -> str:
+def azure_upload_buffer(buffer: Union[bytes, bytearray, memoryview], file_name: str, local_path: str) -> str:
     """
     Uploads a file to Azure Blob Storage.
     :param buffer: Buffer do arquivo a ser enviado.
@@ -60,21 +137,20 @@ def azure_upload_buffer(buffer: bytes, file_name: str, local_path: str) -> str:
     :param local_path: Local onde o arquivo está armazenado.
     :return: Caminho do arquivo enviado.
     """
-    params = AzureUploadBuffer(
-        buffer=buffer,
-        file_name=file_name, 
-        local_path=local_path
-    )
+    if not isinstance(buffer, (bytes, bytearray, memoryview)):
+        raise ExceptionBadRequest(detail="Buffer inválido para upload")
+    
+    # bytes segue direto para o SDK, sem cópia; o SDK trata bytearray/memoryview
+    # como iteráveis genéricos, então esses são convertidos uma vez
+    if not isinstance(buffer, bytes):
+        buffer = bytes(buffer)
+    
     try:
-        settings = Settings()
-        blob_service_client = BlobServiceClient.from_connection_string(settings.AZURE_STORAGE_CONNECTION_STRING)
-        container_client = blob_service_client.get_container_client(settings.AZURE_STORAGE_CONTAINER)
-        
-        blob_client = container_client.get_blob_client(f"{params.local_path}/{params.file_name}")
-        blob_client.upload_blob(params.buffer, overwrite=True)
-        logger.info(f"Arquivo {params.file_name} enviado com sucesso para o Azure Blob Storage como {params.file_name}.")
+        blob_client = _get_container().get_blob_client(f"{local_path}/{file_name}")
+        blob_client.upload_blob(buffer, overwrite=True, max_concurrency=AZURE_UPLOAD_CONCURRENCY)
+        logger.info(f"Arquivo {file_name} enviado com sucesso para o Azure Blob Storage como {file_name}.")
         
-        response = f"{settings.AZURE_STORAGE_LINK}/{settings.AZURE_STORAGE_CONTAINER}/{params.local_path}/{params.file_name}"
+        response = f"{settings.AZURE_STORAGE_LINK}/{settings.AZURE_STORAGE_CONTAINER}/{local_path}/{file_name}"
         
     except Exception as e:
         logger.error(f"Erro ao enviar o arquivo para o Azure: {e}")
@@ -82,20 +158,47 @@ def azure_upload_buffer(buffer: bytes, file_name: str, local_path: str) -> str:
     
     return response
 
-def azure_get_file_exists(file_name: str, local_path: str) -> Optional[BlobClient]:
+async def azure_upload_buffer_async(buffer: Union[bytes, bytearray, memoryview], file_name: str, local_path: str) -> str:
+    """
+    Versão assíncrona de azure_upload_buffer: não ocupa uma thread durante o upload.
+    :param buffer: Buffer do arquivo a ser enviado.
+    :param file_name: Nome do arquivo no Azure Blob Storage.
+    :param local_path: Local onde o arquivo está armazenado.
+    :return: Caminho do arquivo enviado.
+    """
+    if not isinstance(buffer, (bytes, bytearray, memoryview)):
+        raise ExceptionBadRequest(detail="Buffer inválido para upload")
+    
+    if not isinstance(buffer, bytes):
+        buffer = bytes(buffer)
     
     try:
-        settings = Settings()
-        blob_service_client = BlobServiceClient.from_connection_string(settings.AZURE_STORAGE_CONNECTION_STRING)
-        container_client = blob_service_client.get_container_client(settings.AZURE_STORAGE_CONTAINER)
-        blob_path = f"{local_path}/{file_name}"
+        blob_client = _get_async_container().get_blob_client(f"{local_path}/{file_name}")
+        await blob_client.upload_blob(buffer, overwrite=True, max_concurrency=AZURE_UPLOAD_CONCURRENCY)
+        logger.info(f"Arquivo {file_name} enviado com sucesso para o Azure Blob Storage como {file_name}.")
         
-        blob_client = container_client.get_blob_client(blob_path)
-        
-        return blob_client 
-    except Exception:
-        logger.warning(f"Arquivo {file_name} não encontrado em {local_path}")
-        return None
+    except Exception as e:
+        logger.error(f"Erro ao enviar o arquivo para o Azure: {e}")
+        raise ExceptionInternalServerError(detail=f"Erro ao enviar o arquivo para o Azure: {e}")
+    
+    return f"{settings.AZURE_STORAGE_LINK}/{settings.AZURE_STORAGE_CONTAINER}/{local_path}/{file_name}"
+
+
+async def azure_upload_many(items: List[Tuple[Union[bytes, bytearray, memoryview], str, str]]) -> List[str]:
+    """
+    Envia vários buffers ao mesmo tempo, pela mesma sessão HTTP.
+    :param items: Lista de (buffer, file_name, local_path).
+    :return: Caminhos dos arquivos enviados, na mesma ordem de items.
+    """
+    return list(await asyncio.gather(*(
+        azure_upload_buffer_async(buffer, file_name, local_path)
+        for buffer, file_name, local_path in items
+    )))
+
+
+def azure_get_file_exists(file_name: str, local_path: str) -> BlobClient:
+    # Só monta o cliente do blob (sem I/O); a existência é verificada no uso
+    return _get_container().get_blob_client(f"{local_path}/{file_name}")
 
 def azure_get_file_bytes(file_name: str, local_path: str) -> bytes | None:
     """
@@ -107,17 +210,15 @@ def azure_get_file_bytes(file_name: str, local_path: str) -> bytes | None:
     """
     try:        
         blob_path = f"{local_path}/{file_name}"
-        blob_client = azure_get_file_exists(file_name, local_path)
+        blob_client = _get_container().get_blob_client(blob_path)
         
-        if blob_client is None:
+        # Faz o download do conteúdo; um blob inexistente falha já no GET,
+        # sem precisar de um HEAD antes só para verificar
+        try:
+            downloaded_blob = blob_client.download_blob(max_concurrency=AZURE_DOWNLOAD_CONCURRENCY)
+        except ResourceNotFoundError:
             logger.warning(f"Arquivo {file_name} não encontrado em {local_path}")
             return None
-        
-        # Verifica se o blob existe
-        blob_client.get_blob_properties()
-        
-        # Faz o download do conteúdo
-        downloaded_blob = blob_client.download_blob()
         content = downloaded_blob.readall()
         
         logger.info(f"Arquivo {file_name} recuperado com sucesso de {blob_path}")
@@ -1,12 +1,17 @@
 import re
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from starlette.datastructures import QueryParams
 
+from api.utils.crud_utils import VALID_OPERATORS
+
 logger = logging.getLogger(__name__)
 
 FILTER_PATTERN = re.compile(r"filter\[(.+?)\]\[(.+?)\]")
 
+# Operadores que recebem uma lista de valores separados por vírgula
+LIST_OPERATORS = frozenset({'in', 'notin'})
+
 def _parse_filter_value(value: str) -> Any:
     value_lower = value.lower()
     if value_lower in ('true', 'yes', 'on', '1'):
@@ -18,6 +23,10 @@ def _parse_filter_value(value: str) -> Any:
     return value 
 
 
+def _parse_list_value(value: str) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
 def parse_filters(query_params: QueryParams) -> Dict[str, Dict[str, Any]]:
     filters: Dict[str, Dict[str, Any]] = {}
     processed_keys = set() 
@@ -37,7 +46,15 @@ def parse_filters(query_params: QueryParams) -> Dict[str, Dict[str, Any]]:
                 logger.warning(f"Ignorando filtro com field ou operator vazio: {key}")
                 continue 
 
-            parsed_value = _parse_filter_value(value)
+            # Rejeita operadores desconhecidos antes de qualquer query ser montada
+            if operator not in VALID_OPERATORS:
+                raise ValueError(f"Operador de filtro inválido '{operator}' para o campo '{field_specifier}'. Válidos: {sorted(VALID_OPERATORS)}")
+
+            if operator in LIST_OPERATORS:
+                # Separa a lista uma única vez aqui, em vez de a cada aplicação do filtro
+                parsed_value = _parse_list_value(value)
+            else:
+                parsed_value = _parse_filter_value(value)
 
             if field_specifier not in filters:
                 filters[field_specifier] = {}
@@ -86,7 +103,7 @@ if __name__ == '__main__':
 
     print("\n--- Teste 4 ---")
     print(parse_filters(test_params_4))
-    # Esperado: {'tags': {'in': 'python,fastapi'}, 'id': {'eq': '123'}}
+    # Esperado: {'tags': {'in': ['python', 'fastapi']}, 'id': {'eq': '123'}}
 
     print("\n--- Teste 5 ---")
     print(parse_filters(test_params_5))
@@ -10,6 +10,7 @@ load_dotenv()
 
 CAD_PREFIX = "cadastro:"
 AGD_PREFIX = "agendamento:" 
+EXT_PREFIX = "extracao:"
 
 class RedisDB:
     def __init__(self):
@@ -40,17 +41,37 @@ class RedisDB:
                 print("❌ Conexão Redis não está ativa")
                 return False
             
-            # Testa a conexão
-            self.redis_client.ping()
-            
-            # Adiciona a mensagem ao final da lista
-            result = self.redis_client.rpush(telefone, mensagem)
+            # Adiciona a mensagem ao final da lista (sem ping: erros de conexão caem no except)
+            self.redis_client.rpush(telefone, mensagem)
 
             return True
         except Exception as e:
             print(f"❌ Erro ao adicionar mensagem: {e}")
             return False
     
+    def add_messages_bulk(self, telefone: str, mensagens: List[str], ttl_seconds: Optional[int] = None):
+        """Adicionar várias mensagens ao final da lista do telefone em um único round-trip (pipeline)"""
+        try:
+            # Verifica se a conexão está ativa
+            if not self.redis_client:
+                print("❌ Conexão Redis não está ativa")
+                return False
+            
+            if not mensagens:
+                return True
+            
+            with self.redis_client.pipeline(transaction=False) as pipe:
+                for mensagem in mensagens:
+                    pipe.rpush(telefone, mensagem)
+                if ttl_seconds:
+                    pipe.expire(telefone, ttl_seconds)
+                pipe.execute()
+
+            return True
+        except Exception as e:
+            print(f"❌ Erro ao adicionar mensagens em lote: {e}")
+            return False
+    
     def get_messages(self, telefone: str) -> List[str]:
         """Recuperar todas as mensagens de um telefone como lista de strings"""
         try:
@@ -135,4 +156,4 @@ class RedisDB:
         return self.set_json_with_ttl(self.agd_key(telefone), data, ttl_seconds)
 
     def agd_delete(self, telefone: str) -> bool:
-        return self.delete_messages(self.agd_key(telefone))
\ No newline at end of file
+        return self.delete_messages(self.agd_key(telefone))
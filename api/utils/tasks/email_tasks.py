@@ -6,9 +6,11 @@ from typing import Dict, Any, List
 from celery import current_task
 
 from api.utils.celery_app import celery_app
-from api.utils.modules.smtp.email_service import EmailService, EmailTemplateType
+from api.utils.modules.smtp.email_service import get_email_service, EmailTemplateType
 
 
+# Mantém o resultado: é a tarefa que de fato envia, e seu task_id pode ser consultado
+# em /conta/email-status (o PROGRESS abaixo termina em SUCCESS/FAILURE no backend)
 @celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 60})
 def send_email_task(self, template_type: str, to_email: str, variables: Dict[str, Any], 
                    from_name: str = None, custom_subject: str = None):
@@ -29,8 +31,8 @@ def send_email_task(self, template_type: str, to_email: str, variables: Dict[str
             meta={'status': f'Enviando email para {to_email}', 'current': 0, 'total': 1}
         )
         
-        # Inicializar serviço de email
-        email_service = EmailService()
+        # Serviço de email do processo (templates e conexão SMTP reaproveitados entre tarefas)
+        email_service = get_email_service()
         
         # Converter string para enum
         email_template_type = EmailTemplateType(template_type)
@@ -72,7 +74,7 @@ def send_email_task(self, template_type: str, to_email: str, variables: Dict[str
         }
 
 
-@celery_app.task(bind=True)
+@celery_app.task(bind=True, ignore_result=True)
 def send_bulk_emails_task(self, email_list: List[Dict[str, Any]]):
     """
     Tarefa assíncrona para enviar emails em lote
@@ -85,28 +87,11 @@ def send_bulk_emails_task(self, email_list: List[Dict[str, Any]]):
         total_emails = len(email_list)
         results = []
         
-        # Atualizar status inicial
-        current_task.update_state(
-            state='PROGRESS',
-            meta={'status': 'Iniciando envio em lote', 'current': 0, 'total': total_emails}
-        )
-        
-        # Inicializar serviço de email
-        email_service = EmailService()
+        # Serviço de email do processo (templates e conexão SMTP reaproveitados entre tarefas)
+        email_service = get_email_service()
         
         for index, email_data in enumerate(email_list):
             try:
-                # Atualizar progresso
-                current_task.update_state(
-                    state='PROGRESS',
-                    meta={
-                        'status': f'Enviando email {index + 1} de {total_emails}',
-                        'current': index,
-                        'total': total_emails,
-                        'to_email': email_data['to_email']
-                    }
-                )
-                
                 # Converter string para enum
                 email_template_type = EmailTemplateType(email_data['template_type'])
                 
@@ -166,12 +151,12 @@ def send_bulk_emails_task(self, email_list: List[Dict[str, Any]]):
         }
 
 
-@celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 120})
-def send_notification_email_task(self, to_email: str, user_name: str, message: str, 
-                                notification_subject: str, action_button: str = "", 
-                                additional_info: str = ""):
+def notification_email_signature(to_email: str, user_name: str, message: str, 
+                                 notification_subject: str, action_button: str = "", 
+                                 additional_info: str = ""):
     """
-    Tarefa de conveniência para envio de email de notificação
+    Monta a assinatura do send_email_task de notificação, já na fila de email.
+    Usada para enfileirar um envio isolado ou vários de uma vez com `group`.
     """
     variables = {
         "user_name": user_name,
@@ -181,16 +166,40 @@ def send_notification_email_task(self, to_email: str, user_name: str, message: s
         "additional_info": additional_info
     }
     
-    return send_email_task.apply_async(
-        args=['notification', to_email, variables],
+    return send_email_task.signature(
+        args=('notification', to_email, variables),
         queue='email'
     )
 
 
-@celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 120})
-def send_welcome_email_task(self, to_email: str, user_name: str, dashboard_link: str = None):
+def enqueue_notification_email(to_email: str, user_name: str, message: str, 
+                               notification_subject: str, action_button: str = "", 
+                               additional_info: str = ""):
     """
-    Tarefa de conveniência para envio de email de boas-vindas
+    Enfileira diretamente o send_email_task de notificação.
+    O AsyncResult retornado aponta para a tarefa que envia o email (resultado mantido).
+    """
+    return notification_email_signature(
+        to_email, user_name, message, notification_subject, action_button, additional_info
+    ).apply_async()
+
+
+@celery_app.task(bind=True, ignore_result=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 120})
+def send_notification_email_task(self, to_email: str, user_name: str, message: str, 
+                                notification_subject: str, action_button: str = "", 
+                                additional_info: str = ""):
+    """
+    Tarefa de conveniência para envio de email de notificação
+    """
+    return enqueue_notification_email(
+        to_email, user_name, message, notification_subject, action_button, additional_info
+    )
+
+
+def enqueue_welcome_email(to_email: str, user_name: str, dashboard_link: str = None):
+    """
+    Enfileira diretamente o send_email_task de boas-vindas.
+    O AsyncResult retornado aponta para a tarefa que envia o email (resultado mantido).
     """
     variables = {
         "user_name": user_name,
@@ -203,10 +212,18 @@ def send_welcome_email_task(self, to_email: str, user_name: str, dashboard_link:
     )
 
 
-@celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 120})
-def send_password_reset_email_task(self, to_email: str, token: str, expiry_time: str = "1 hora"):
+@celery_app.task(bind=True, ignore_result=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 120})
+def send_welcome_email_task(self, to_email: str, user_name: str, dashboard_link: str = None):
     """
-    Tarefa de conveniência para envio de email de reset de senha
+    Tarefa de conveniência para envio de email de boas-vindas
+    """
+    return enqueue_welcome_email(to_email, user_name, dashboard_link)
+
+
+def enqueue_password_reset_email(to_email: str, token: str, expiry_time: str = "1 hora"):
+    """
+    Enfileira diretamente o send_email_task de reset de senha.
+    O AsyncResult retornado aponta para a tarefa que envia o email (resultado mantido).
     """
     from api.utils.settings import settings
     
@@ -221,11 +238,19 @@ def send_password_reset_email_task(self, to_email: str, token: str, expiry_time:
     )
 
 
-@celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 120})
-def send_verification_email_task(self, to_email: str, verification_link: str, 
-                                verification_code: str, expiry_time: str = "24 horas"):
+@celery_app.task(bind=True, ignore_result=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 120})
+def send_password_reset_email_task(self, to_email: str, token: str, expiry_time: str = "1 hora"):
     """
-    Tarefa de conveniência para envio de email de verificação
+    Tarefa de conveniência para envio de email de reset de senha
+    """
+    return enqueue_password_reset_email(to_email, token, expiry_time)
+
+
+def enqueue_verification_email(to_email: str, verification_link: str, 
+                               verification_code: str, expiry_time: str = "24 horas"):
+    """
+    Enfileira diretamente o send_email_task de verificação.
+    O AsyncResult retornado aponta para a tarefa que envia o email (resultado mantido).
     """
     variables = {
         "verification_link": verification_link,
@@ -236,4 +261,13 @@ def send_verification_email_task(self, to_email: str, verification_link: str,
     return send_email_task.apply_async(
         args=['verification', to_email, variables],
         queue='email'
-    ) 
\ No newline at end of file
+    )
+
+
+@celery_app.task(bind=True, ignore_result=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 120})
+def send_verification_email_task(self, to_email: str, verification_link: str, 
+                                verification_code: str, expiry_time: str = "24 horas"):
+    """
+    Tarefa de conveniência para envio de email de verificação
+    """
+    return enqueue_verification_email(to_email, verification_link, verification_code, expiry_time)
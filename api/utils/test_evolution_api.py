@@ -0,0 +1,68 @@
+"""
+Testes da decodificação incremental do base64 da Evolution API (_decode_base64_field)
+"""
+
+import asyncio
+import base64
+import json
+import os
+import sys
+
+# Adicionar o caminho do projeto para permitir imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from api.utils.evolution_api import _decode_base64_field
+
+MEDIA = bytes(range(256)) * 10
+MEDIA_B64 = base64.b64encode(MEDIA).decode("ascii")
+# Tamanhos de chunk que dividem a chave, o prefixo data: e o base64 em pontos diferentes
+CHUNK_SIZES = (1, 3, 7, 64, 1 << 20)
+
+
+def _decode(body: dict, chunk_size: int) -> bytes:
+    raw = json.dumps(body).encode("utf-8")
+
+    async def chunks():
+        for i in range(0, len(raw), chunk_size):
+            yield raw[i:i + chunk_size]
+
+    async def collect():
+        return b"".join([block async for block in _decode_base64_field(chunks())])
+
+    return asyncio.run(collect())
+
+
+def test_base64_dividido_entre_chunks():
+    for chunk_size in CHUNK_SIZES:
+        assert _decode({"mediaType": "audio", "base64": MEDIA_B64}, chunk_size) == MEDIA
+
+
+def test_base64_com_prefixo_data_dentro_de_data():
+    body = {"data": {"base64": f"data:audio/ogg;base64,{MEDIA_B64}"}}
+    for chunk_size in CHUNK_SIZES:
+        assert _decode(body, chunk_size) == MEDIA
+
+
+def test_base64_na_chave_media():
+    # "media" como valor de outro campo não deve ser confundido com a chave
+    body = {"type": "media", "media": MEDIA_B64}
+    for chunk_size in CHUNK_SIZES:
+        assert _decode(body, chunk_size) == MEDIA
+
+
+def test_sem_campo_base64():
+    try:
+        _decode({"status": "ok"}, 3)
+    except ValueError:
+        return
+    raise AssertionError("ValueError esperado quando não há campo base64")
+
+
+if __name__ == "__main__":
+    test_base64_dividido_entre_chunks()
+    test_base64_com_prefixo_data_dentro_de_data()
+    test_base64_na_chave_media()
+    test_sem_campo_base64()
+    print("✅ Todos os testes de decodificação passaram")
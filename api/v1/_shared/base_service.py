@@ -149,9 +149,12 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType, Generic
             base_query = apply_search(base_query, self.model_class, search, self.searchable_fields)
             count_query = apply_search(count_query.select_from(self.model_class), self.model_class, search, self.searchable_fields)
         
+        # Joins aplicados em base_query, compartilhados entre filtros e ordenação
+        applied_joins = set()
+        
         if filter_params:
             try:
-                base_query = apply_filters(base_query, self.model_class, filter_params, self.relationship_map)
+                base_query = apply_filters(base_query, self.model_class, filter_params, self.relationship_map, applied_joins)
                 count_query = apply_filters(count_query.select_from(self.model_class), self.model_class, filter_params, self.relationship_map)
             except ValueError as e:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid filter parameter: {str(e)}")
@@ -160,7 +163,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType, Generic
         
         if sort_by:
             try:
-                base_query = apply_sorting(base_query, self.model_class, sort_by, sort_dir, self.relationship_map)
+                base_query = apply_sorting(base_query, self.model_class, sort_by, sort_dir, self.relationship_map, applied_joins)
             except ValueError as e:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid sort parameter: {str(e)}")
         
@@ -421,9 +424,12 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType, Generic
             base_query = apply_search(base_query, self.model_class, search, self.searchable_fields)
             count_query = apply_search(count_query.select_from(self.model_class), self.model_class, search, self.searchable_fields)
         
+        # Joins aplicados em base_query, compartilhados entre filtros e ordenação
+        applied_joins = set()
+        
         if filter_params:
             try:
-                base_query = apply_filters(base_query, self.model_class, filter_params, self.relationship_map)
+                base_query = apply_filters(base_query, self.model_class, filter_params, self.relationship_map, applied_joins)
                 count_query = apply_filters(count_query.select_from(self.model_class), self.model_class, filter_params, self.relationship_map)
             except ValueError as e:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid filter parameter: {str(e)}")
@@ -432,7 +438,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType, Generic
         
         if sort_by:
             try:
-                base_query = apply_sorting(base_query, self.model_class, sort_by, sort_dir, self.relationship_map)
+                base_query = apply_sorting(base_query, self.model_class, sort_by, sort_dir, self.relationship_map, applied_joins)
             except ValueError as e:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid sort parameter: {str(e)}")
         
@@ -3,12 +3,11 @@ import logging
 from typing import Optional
 from uuid import UUID
 
-from decouple import config
-from openai import OpenAI
 from sqlalchemy.orm import Session
 
 from api.utils.celery_app import celery_app
 from api.utils.db_services import get_db
+from api.utils.ia.openai_client import get_openai_client
 from api.v1._database.models import WebLink
 from api.v1._shared.schemas import WebLinkUpdate
 from api.v1.web_link.ia.summarize import generate_summary
@@ -18,7 +17,6 @@ from api.v1.web_link.service import WebLinkService
 
 
 logger = logging.getLogger(__name__)
-OPENAI_API_KEY = config("OPENAI_API_KEY")
 
 @celery_app.task(
     name="api.v1.web_link.celery.tasks.scrape_url_task",
@@ -58,7 +56,7 @@ def scrape_url_task(self, weblink_id: str, url: str) -> Optional[dict]:
         print("="*80 + "\n")
         
         # 2) Gera resumo usando OpenAI
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = get_openai_client()
         
         logger.info(f"[RESUMO] Gerando resumo para WebLink ID: {weblink_id}")
         summary = generate_summary(
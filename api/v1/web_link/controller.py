@@ -2,7 +2,6 @@ import logging
 from typing import Literal, Optional
 from uuid import UUID
 
-from decouple import config
 from fastapi import (
     APIRouter,
     Depends,
@@ -13,11 +12,11 @@ from fastapi import (
     Response,
     status,
 )
-from openai import OpenAI
 from sqlalchemy.orm import Session
 
 from api.utils.db_services import get_db
 from api.utils.exceptions import exception_invalid_query, exception_nao_encontrado
+from api.utils.ia.openai_client import get_openai_client
 from api.utils.security import get_current_user
 from api.utils.permissions import require
 from api.utils.query_parser import parse_filters
@@ -32,8 +31,6 @@ from api.v1.web_link.use_case import WebLinkUseCase
 
 logger = logging.getLogger(__name__)
 
-OPENAI_API_KEY = config("OPENAI_API_KEY")
-
 
 router = APIRouter(
     prefix="/web_links",
@@ -231,7 +228,7 @@ async def ask_weblink(
     Retorna a resposta gerada pela IA com score de confiança e tokens usados.
     """
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = get_openai_client()
         
         result = query_weblink_knowledge(
             db=db,
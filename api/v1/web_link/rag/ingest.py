@@ -46,7 +46,9 @@ def _chunk_text(text: str, max_chars: int = MAX_CHARS) -> List[str]:
     # Primeiro tenta dividir por parágrafos duplos
     paragraphs = text.split('\n\n')
     chunks = []
-    current_chunk = ""
+    # Parágrafos do chunk atual, unidos só ao fechar o chunk (evita concatenar str a cada passo)
+    current_parts: List[str] = []
+    current_len = 0
     
     for para in paragraphs:
         para = para.strip()
@@ -55,24 +57,27 @@ def _chunk_text(text: str, max_chars: int = MAX_CHARS) -> List[str]:
             
         # Se o parágrafo sozinho já é muito grande, divide ele
         if len(para) > max_chars:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = ""
+            if current_parts:
+                chunks.append("\n\n".join(current_parts))
+                current_parts = []
+                current_len = 0
             
             # Divide o parágrafo grande usando wrap
             para_chunks = wrap(para, max_chars, break_long_words=False, replace_whitespace=False)
             chunks.extend([c.strip() for c in para_chunks if c.strip()])
         else:
             # Se adicionar este parágrafo exceder o limite, finaliza o chunk atual
-            if current_chunk and len(current_chunk) + len(para) + 2 > max_chars:
-                chunks.append(current_chunk.strip())
-                current_chunk = para
+            if current_parts and current_len + len(para) + 2 > max_chars:
+                chunks.append("\n\n".join(current_parts))
+                current_parts = [para]
+                current_len = len(para)
             else:
-                current_chunk += "\n\n" + para if current_chunk else para
+                current_len += len(para) + 2 if current_parts else len(para)
+                current_parts.append(para)
     
     # Adiciona o último chunk se houver
-    if current_chunk.strip():
-        chunks.append(current_chunk.strip())
+    if current_parts:
+        chunks.append("\n\n".join(current_parts))
     
     return [c for c in chunks if len(c) >= MIN_CHARS_TO_PROCESS]
 
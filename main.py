@@ -1,21 +1,56 @@
+import asyncio
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
 import logging
+import logging.handlers
+import queue
 
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi import HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from api.v1.routes import routes
 
 
 logging.basicConfig(level=logging.INFO)
+
+# Move a escrita dos logs para uma thread dedicada: os handlers configurados
+# acima passam a ser alimentados por um QueueListener e a requisição só
+# enfileira o registro (QueueHandler), sem bloquear em I/O de stdout.
+_root_logger = logging.getLogger()
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, *_root_logger.handlers, respect_handler_level=True
+)
+_root_logger.handlers = [logging.handlers.QueueHandler(_log_queue)]
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
+# Threads disponíveis para trabalho síncrono: rotas/dependências sync (limitador
+# do anyio) e asyncio.to_thread, usado na extração de PDF, áudio etc. (executor padrão do loop)
+THREAD_POOL_SIZE = 100
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Amplia o limite do anyio (padrão 40), que só governa rotas e dependências sync
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREAD_POOL_SIZE
+    # asyncio.to_thread roda no executor padrão do loop (padrão min(32, CPUs + 4) threads)
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE))
+    yield
+
 
 app = FastAPI(
     title="Teste - Seletivo", 
-    version="0.0.1"
+    version="0.0.1",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 app.include_router(routes)
 
@@ -31,7 +66,7 @@ app.add_middleware(
 
 @app.exception_handler(HTTPException)
 async def custom_http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail},
     )